@@ -1,6 +1,8 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Query
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import ORJSONResponse, Response
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+import asyncio
 import os
 import logging
 from pydantic import BaseModel
@@ -23,8 +25,11 @@ logger = logging.getLogger("SOLANA_API")
 # ======================================================
 # IMPORT SERVICES
 # ======================================================
-from services.token_service import get_token_service
+from services.token_service import TokenService, get_token_service
 from services.currency_service import get_currency_service
+from services.http_client import close_http_client
+from utils.exceptions import BaseAPIException, ValidationException
+from utils.validators import validate_solana_address
 
 # Import Jupiter Service (Pastikan file services/jupiter_service.py ada)
 try:
@@ -33,6 +38,11 @@ except ImportError:
     logger.warning("Warning: services/jupiter_service.py not found. Real swap will fail.")
     get_jupiter_service = None
 
+# Dependency async: FastAPI menjalankan dependency sync di threadpool, jadi
+# getter lru_cache dibungkus agar tiap request tidak membayar thread hop
+async def token_service_dep() -> TokenService:
+    return get_token_service()
+
 # ======================================================
 # FASTAPI APP
 # ======================================================
@@ -46,6 +56,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ======================================================
+# LIFECYCLE
+# ======================================================
+@app.on_event("startup")
+async def start_background_tasks():
+    # Jaga cache harga token default tetap hangat
+    get_token_service().start_background_tasks()
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    await get_token_service().close()
+    await close_http_client()
+
 # ======================================================
 # MODELS
 # ======================================================
@@ -63,41 +86,35 @@ api_router = APIRouter(prefix="/api")
 # 1. FIX ERROR: token-list 404
 # ======================================================
 @api_router.get("/token-list")
-async def get_token_list():
+async def get_token_list(service: TokenService = Depends(token_service_dep)):
     """Endpoint untuk daftar token default"""
-    service = get_token_service()
-    # Kita panggil method get_token_list dari service, atau return manual jika belum ada
-    if hasattr(service, 'get_token_list'):
-        return await service.get_token_list()
-    
-    # Fallback jika method tidak ada di service
-    return [
-        {"address": "So11111111111111111111111111111111111111112", "symbol": "SOL", "name": "Solana", "decimals": 9, "logoURI": "https://raw.githubusercontent.com/solana-labs/token-list/main/assets/mainnet/So11111111111111111111111111111111111111112/logo.png"},
-        {"address": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v", "symbol": "USDC", "name": "USD Coin", "decimals": 6, "logoURI": "https://raw.githubusercontent.com/solana-labs/token-list/main/assets/mainnet/EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v/logo.png"}
-    ]
+    # JSON sudah diserialisasi sekali saat startup
+    return Response(content=service.get_token_list_json(), media_type="application/json")
 
 # ======================================================
 # 2. FIX ERROR: token-info 404 (Query Param Style)
 # ======================================================
 @api_router.get("/token-info")
-async def get_token_info(address: str = Query(..., alias="address")):
+async def get_token_info(
+    address: str = Query(..., alias="address"),
+    service: TokenService = Depends(token_service_dep)
+):
     """
     Frontend memanggil: /api/token-info?address=...
     Endpoint ini menjembatani ke logic metadata.
     """
-    return await get_metadata_logic(address)
+    return await get_metadata_logic(address, service)
 
 # Endpoint lama (Path Param Style) tetap kita simpan
 @api_router.get("/token-metadata/{token_address}")
-async def get_metadata_path(token_address: str):
-    return await get_metadata_logic(token_address)
+async def get_metadata_path(token_address: str, service: TokenService = Depends(token_service_dep)):
+    return await get_metadata_logic(token_address, service)
 
-async def get_metadata_logic(token_address: str):
+async def get_metadata_logic(token_address: str, service: TokenService):
     logger.info(f"Metadata request: {token_address}")
     if len(token_address) < 30:
         raise HTTPException(status_code=400, detail="Invalid address")
     
-    service = get_token_service()
     metadata = await service.get_token_metadata(token_address)
     if not metadata:
         # Return fallback mock agar frontend tidak error
@@ -115,11 +132,71 @@ async def get_metadata_logic(token_address: str):
 # TOKEN BALANCE
 # ======================================================
 @api_router.get("/token-balance")
-async def token_balance(wallet: str, token_mint: str): # Hapus validasi ketat query
+async def token_balance(
+    wallet: str,
+    token_mint: str, # Hapus validasi ketat query
+    service: TokenService = Depends(token_service_dep)
+):
     logger.info(f"Balance request wallet={wallet} mint={token_mint}")
-    service = get_token_service()
     return await service.get_token_balance(wallet, token_mint)
 
+# ======================================================
+# TOKEN BALANCE STREAM (WebSocket push instead of polling)
+# ======================================================
+@api_router.websocket("/ws/token-balance")
+async def token_balance_stream(
+    websocket: WebSocket,
+    wallet: str,
+    token_mint: str,
+    service: TokenService = Depends(token_service_dep)
+):
+    """
+    Push saldo token setiap kali berubah on-chain.
+    Pesan pertama adalah saldo saat ini.
+    """
+    await websocket.accept()
+
+    try:
+        queue = await service.subscribe_balance(wallet, token_mint)
+    except BaseAPIException as e:
+        await websocket.send_json({"error": e.message})
+        await websocket.close(code=1008)
+        return
+
+    # Baca socket bersamaan dengan queue, supaya client yang disconnect
+    # langsung terdeteksi walaupun saldo tidak berubah
+    receiver = asyncio.ensure_future(websocket.receive())
+    getter = asyncio.ensure_future(queue.get())
+    stream_ended = False
+    try:
+        while True:
+            done, _ = await asyncio.wait({receiver, getter}, return_when=asyncio.FIRST_COMPLETED)
+
+            if receiver in done:
+                if receiver.result()["type"] == "websocket.disconnect":
+                    break
+                # Pesan dari client diabaikan
+                receiver = asyncio.ensure_future(websocket.receive())
+
+            if getter in done:
+                update = getter.result()
+                if update is None:
+                    stream_ended = True
+                    break
+                await websocket.send_json(update)
+                getter = asyncio.ensure_future(queue.get())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+        getter.cancel()
+        await service.unsubscribe_balance(wallet, token_mint, queue)
+
+    # Tutup hanya jika stream berakhir dari sisi server; socket yang sudah
+    # disconnect tidak boleh dikirimi close lagi
+    if stream_ended:
+        await websocket.close()
+
 # ======================================================
 # MULTIPLE TOKEN BALANCES
 # ======================================================
@@ -128,7 +205,10 @@ class TokenBalancesRequest(BaseModel):
     token_mints: list[str]
 
 @api_router.post("/token-balances")
-async def get_multiple_token_balances(request: TokenBalancesRequest):
+async def get_multiple_token_balances(
+    request: TokenBalancesRequest,
+    service: TokenService = Depends(token_service_dep)
+):
     """
     Get balances for multiple tokens at once.
     Used by TokenSelectDialog to show balances for all tokens.
@@ -138,17 +218,19 @@ async def get_multiple_token_balances(request: TokenBalancesRequest):
     if not request.wallet or len(request.wallet) < 32:
         return {"balances": {}}
     
-    service = get_token_service()
-    balances = {}
+    # Fetch semua balance bersamaan; request SPL untuk wallet yang sama
+    # digabung oleh service menjadi satu RPC
+    results = await asyncio.gather(
+        *(service.get_token_balance(request.wallet, mint) for mint in request.token_mints),
+        return_exceptions=True
+    )
     
-    # Fetch balance for each token
-    for mint in request.token_mints:
-        try:
-            balance_data = await service.get_token_balance(request.wallet, mint)
-            balances[mint] = balance_data
-        except Exception as e:
-            logger.error(f"Error fetching balance for {mint}: {e}")
-            balances[mint] = {"balance": 0, "uiAmount": 0, "decimals": 0}
+    balances = {}
+    for mint, balance_data in zip(request.token_mints, results):
+        if isinstance(balance_data, Exception):
+            logger.error(f"Error fetching balance for {mint}: {balance_data}")
+            balance_data = {"balance": 0, "uiAmount": 0, "decimals": 0}
+        balances[mint] = balance_data
     
     return {"balances": balances}
 
@@ -156,20 +238,21 @@ async def get_multiple_token_balances(request: TokenBalancesRequest):
 # VALIDATE TOKEN
 # ======================================================
 @api_router.post("/validate-token/{token_address}")
-async def validate_token(token_address: str):
+async def validate_token(token_address: str, service: TokenService = Depends(token_service_dep)):
     """
     Validate if a token address is valid and exists on Solana.
     Used before adding custom tokens.
     """
     logger.info(f"Validate token request: {token_address}")
     
-    # Basic validation - check address format
-    if not token_address or len(token_address) < 32 or len(token_address) > 44:
+    # Basic validation - base58 charset + length, resolved locally before any RPC
+    try:
+        token_address = validate_solana_address(token_address)
+    except ValidationException:
         return {"valid": False, "error": "Invalid address format"}
     
     try:
         # Try to get metadata - if successful, token is valid
-        service = get_token_service()
         metadata = await service.get_token_metadata(token_address)
         
         # Check if we got valid metadata
@@ -194,22 +277,21 @@ async def validate_token(token_address: str):
 # WALLET PORTFOLIO (Total Balance + All Tokens)
 # ======================================================
 @api_router.get("/wallet-portfolio")
-async def wallet_portfolio(wallet: str):
+async def wallet_portfolio(wallet: str, service: TokenService = Depends(token_service_dep)):
     """
     Mendapatkan total balance wallet dalam USD + breakdown semua token.
     Menghitung: balance × price untuk setiap token, termasuk yang harganya 0.
     """
     logger.info(f"Portfolio request for wallet: {wallet}")
-    service = get_token_service()
     return await service.get_wallet_portfolio(wallet)
 
 # ======================================================
 # PRICE CHART
 # ======================================================
-@api_router.get("/price-chart")
-async def price_chart(token: str, interval: str = "1h"):
-    service = get_token_service()
-    return await service.get_token_price_chart(token, interval)
+@api_router.get("/price-chart", response_class=ORJSONResponse)
+async def price_chart(token: str, interval: str = "1h", service: TokenService = Depends(token_service_dep)):
+    # Serialize sekali dengan orjson, lewati jsonable_encoder FastAPI
+    return ORJSONResponse(await service.get_token_price_chart(token, interval))
 
 # ======================================================
 # EXCHANGE RATE (USD TO IDR)
@@ -0,0 +1,219 @@
+"""Push-based balance updates over Solana's WebSocket RPC.
+
+Instead of replaying ``getBalance`` / ``getTokenAccountsByOwner`` on every
+poll, a single WebSocket connection holds one ``accountSubscribe`` per
+watched (wallet, mint) pair and pushes balance deltas to subscribers.
+
+Documentation:
+- accountSubscribe: https://solana.com/docs/rpc/websocket/accountsubscribe
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+import websockets
+
+from utils.exceptions import TokenServiceException
+
+logger = logging.getLogger(__name__)
+
+BalanceKey = Tuple[str, str]
+
+
+class BalanceStream:
+    """Shared WebSocket connection multiplexing balance subscriptions.
+
+    Each (wallet, mint) pair maps to one RPC subscription, however many
+    local subscribers are listening. The most recent balance for every
+    active pair is kept in ``latest`` so callers can read it without an
+    RPC round-trip.
+
+    Attributes:
+        ws_url: Solana WebSocket RPC endpoint
+        latest: Most recent balance per (wallet, mint)
+    """
+
+    def __init__(self, ws_url: str):
+        self.ws_url = ws_url
+        self.latest: Dict[BalanceKey, Dict[str, Any]] = {}
+
+        self._ws = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._connect_lock = asyncio.Lock()
+        self._subscribe_lock = asyncio.Lock()
+        self._request_id = 0
+        self._pending: Dict[int, asyncio.Future] = {}
+
+        # RPC subscription id -> (key, is_native)
+        self._subscriptions: Dict[int, Tuple[BalanceKey, bool]] = {}
+        self._subscription_ids: Dict[BalanceKey, int] = {}
+        self._queues: Dict[BalanceKey, List[asyncio.Queue]] = {}
+
+    async def _ensure_connected(self) -> None:
+        async with self._connect_lock:
+            if self._ws is not None:
+                return
+            self._ws = await websockets.connect(self.ws_url)
+            self._reader_task = asyncio.create_task(self._reader())
+            logger.info("Balance stream connected")
+
+    async def _request(self, method: str, params: list) -> Any:
+        """Send a JSON-RPC request over the socket and wait for its result."""
+        self._request_id += 1
+        request_id = self._request_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+
+        await self._ws.send(orjson.dumps({
+            "jsonrpc": "2.0", "id": request_id,
+            "method": method, "params": params
+        }).decode())
+
+        try:
+            return await asyncio.wait_for(future, timeout=10.0)
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def subscribe(
+        self,
+        wallet: str,
+        mint: str,
+        account: str,
+        initial: Dict[str, Any],
+        is_native: bool = False
+    ) -> asyncio.Queue:
+        """Start receiving balance updates for a (wallet, mint) pair.
+
+        Args:
+            wallet: Wallet address
+            mint: Token mint address
+            account: Account to watch (the wallet for SOL, the token account for SPL)
+            initial: Balance fetched over HTTP, pushed as the first update
+            is_native: True when watching native SOL lamports
+
+        Returns:
+            Queue receiving balance dicts; ``None`` signals the stream closed
+        """
+        key = (wallet, mint)
+        await self._ensure_connected()
+
+        async with self._subscribe_lock:
+            if key not in self._subscription_ids:
+                subscription_id = await self._request(
+                    "accountSubscribe",
+                    [account, {"encoding": "jsonParsed", "commitment": "confirmed"}]
+                )
+                self._subscriptions[subscription_id] = (key, is_native)
+                self._subscription_ids[key] = subscription_id
+                self.latest[key] = initial
+
+            queue: asyncio.Queue = asyncio.Queue()
+            queue.put_nowait(self.latest[key])
+            self._queues.setdefault(key, []).append(queue)
+            return queue
+
+    async def unsubscribe(self, wallet: str, mint: str, queue: asyncio.Queue) -> None:
+        """Stop delivering updates to ``queue``; drops the RPC subscription when unused."""
+        key = (wallet, mint)
+        async with self._subscribe_lock:
+            queues = self._queues.get(key, [])
+            if queue in queues:
+                queues.remove(queue)
+            if queues:
+                return
+
+            self._queues.pop(key, None)
+            self.latest.pop(key, None)
+            subscription_id = self._subscription_ids.pop(key, None)
+            if subscription_id is None:
+                return
+
+            self._subscriptions.pop(subscription_id, None)
+            if self._ws is not None:
+                try:
+                    await self._request("accountUnsubscribe", [subscription_id])
+                except Exception as e:
+                    logger.warning(f"accountUnsubscribe failed for {key}: {e}")
+
+    @staticmethod
+    def _parse_balance(value: Dict[str, Any], is_native: bool) -> Dict[str, Any]:
+        if is_native:
+            lamports = value.get("lamports", 0)
+            return {"balance": lamports, "uiAmount": lamports / 1e9, "decimals": 9}
+
+        amount_info = value["data"]["parsed"]["info"]["tokenAmount"]
+        return {
+            "balance": int(amount_info["amount"]),
+            "uiAmount": float(amount_info["uiAmount"] or 0),
+            "decimals": int(amount_info["decimals"])
+        }
+
+    async def _reader(self) -> None:
+        try:
+            async for raw in self._ws:
+                message = orjson.loads(raw)
+
+                if "id" in message:
+                    future = self._pending.get(message["id"])
+                    if future is not None and not future.done():
+                        if "error" in message:
+                            future.set_exception(TokenServiceException(
+                                "Balance subscription failed",
+                                details={"error": message["error"]}
+                            ))
+                        else:
+                            future.set_result(message.get("result"))
+                    continue
+
+                if message.get("method") != "accountNotification":
+                    continue
+
+                params = message.get("params", {})
+                entry = self._subscriptions.get(params.get("subscription"))
+                if entry is None:
+                    continue
+
+                key, is_native = entry
+                try:
+                    balance = self._parse_balance(params["result"]["value"], is_native)
+                except (KeyError, TypeError, ValueError) as e:
+                    logger.warning(f"Unparseable balance notification for {key}: {e}")
+                    continue
+
+                self.latest[key] = balance
+                for queue in self._queues.get(key, []):
+                    queue.put_nowait(balance)
+
+        except Exception as e:
+            logger.error(f"Balance stream error: {e}")
+        finally:
+            self._reset()
+
+    def _reset(self) -> None:
+        """Drop all subscriptions after the socket closes."""
+        logger.warning("Balance stream disconnected")
+        self._ws = None
+        self._reader_task = None
+
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(TokenServiceException("Balance stream disconnected"))
+        self._pending.clear()
+
+        for queues in self._queues.values():
+            for queue in queues:
+                queue.put_nowait(None)
+
+        self._queues.clear()
+        self._subscriptions.clear()
+        self._subscription_ids.clear()
+        self.latest.clear()
+
+    async def close(self) -> None:
+        """Close the WebSocket connection."""
+        if self._ws is not None:
+            await self._ws.close()
+        if self._reader_task is not None:
+            await self._reader_task
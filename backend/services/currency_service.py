@@ -4,11 +4,13 @@ Provides real-time USD to IDR exchange rates with caching.
 Uses free exchangerate-api.com API with fallback to hardcoded rate.
 """
 
-import httpx
 import logging
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional, Dict
 
+from services.http_client import get_http_client
+
 logger = logging.getLogger(__name__)
 
 class CurrencyService:
@@ -79,43 +81,41 @@ class CurrencyService:
         """
         # Provider 1: exchangerate-api.com
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                url = "https://api.exchangerate-api.com/v4/latest/USD"
-                response = await client.get(url)
+            url = "https://api.exchangerate-api.com/v4/latest/USD"
+            response = await get_http_client().get(url, timeout=5.0)
+            
+            if response.status_code == 200:
+                data = response.json()
+                idr_rate = data.get("rates", {}).get("IDR")
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    idr_rate = data.get("rates", {}).get("IDR")
-                    
-                    if idr_rate:
-                        logger.info(f"Fetched exchange rate from exchangerate-api: {idr_rate} IDR")
-                        return {
-                            "rate": float(idr_rate),
-                            "last_update": datetime.now().isoformat(),
-                            "source": "exchangerate-api.com",
-                            "currency_pair": "USD/IDR"
-                        }
+                if idr_rate:
+                    logger.info(f"Fetched exchange rate from exchangerate-api: {idr_rate} IDR")
+                    return {
+                        "rate": float(idr_rate),
+                        "last_update": datetime.now().isoformat(),
+                        "source": "exchangerate-api.com",
+                        "currency_pair": "USD/IDR"
+                    }
         except Exception as e:
             logger.warning(f"exchangerate-api.com failed: {e}")
         
         # Provider 2: frankfurter.app
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                url = "https://api.frankfurter.app/latest?from=USD&to=IDR"
-                response = await client.get(url)
+            url = "https://api.frankfurter.app/latest?from=USD&to=IDR"
+            response = await get_http_client().get(url, timeout=5.0)
+            
+            if response.status_code == 200:
+                data = response.json()
+                idr_rate = data.get("rates", {}).get("IDR")
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    idr_rate = data.get("rates", {}).get("IDR")
-                    
-                    if idr_rate:
-                        logger.info(f"Fetched exchange rate from frankfurter: {idr_rate} IDR")
-                        return {
-                            "rate": float(idr_rate),
-                            "last_update": datetime.now().isoformat(),
-                            "source": "frankfurter.app",
-                            "currency_pair": "USD/IDR"
-                        }
+                if idr_rate:
+                    logger.info(f"Fetched exchange rate from frankfurter: {idr_rate} IDR")
+                    return {
+                        "rate": float(idr_rate),
+                        "last_update": datetime.now().isoformat(),
+                        "source": "frankfurter.app",
+                        "currency_pair": "USD/IDR"
+                    }
         except Exception as e:
             logger.warning(f"frankfurter.app failed: {e}")
         
@@ -136,11 +136,7 @@ class CurrencyService:
         return float(usd_amount) * float(rate)
 
 # Singleton instance
-_currency_service = None
-
+@lru_cache(maxsize=1)
 def get_currency_service() -> CurrencyService:
     """Get singleton instance of CurrencyService."""
-    global _currency_service
-    if _currency_service is None:
-        _currency_service = CurrencyService()
-    return _currency_service
+    return CurrencyService()
@@ -0,0 +1,39 @@
+"""Shared HTTP client for outbound API calls.
+
+A single pooled ``httpx.AsyncClient`` (HTTP/2 + keep-alive) is reused by
+every service, so repeated calls to DexScreener, GeckoTerminal, Helius,
+Jupiter and the exchange-rate providers skip TCP and TLS setup. Connections
+go back to the pool as soon as a response body has been read.
+
+The client is closed once on application shutdown via close_http_client().
+"""
+
+import httpx
+
+_HTTP = httpx.AsyncClient(
+    http2=True,
+    timeout=httpx.Timeout(3.0, connect=1.0),
+    limits=httpx.Limits(
+        max_connections=200,
+        max_keepalive_connections=100,
+        keepalive_expiry=60
+    )
+)
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the process-wide pooled HTTP client.
+
+    Returns:
+        Shared httpx.AsyncClient instance
+
+    Examples:
+        >>> client = get_http_client()
+        >>> response = await client.get(url, timeout=5.0)
+    """
+    return _HTTP
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and release pooled connections."""
+    await _HTTP.aclose()
@@ -11,10 +11,13 @@ Note: lite-api.jup.ag will be deprecated on January 31, 2026.
 
 import os
 import httpx
+import orjson
 import logging
+from functools import lru_cache
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
 
+from services.http_client import get_http_client
 from utils.exceptions import JupiterServiceException, ValidationException
 from utils.validators import validate_solana_address, validate_positive_amount, validate_slippage_bps
 
@@ -159,29 +162,29 @@ class JupiterService:
             )
             
             # Make API request
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.api_url}/quote",
-                    params=params,
-                    headers=self._get_headers()
+            response = await get_http_client().get(
+                f"{self.api_url}/quote",
+                params=params,
+                headers=self._get_headers(),
+                timeout=self.timeout
+            )
+            
+            if response.status_code == 200:
+                quote = orjson.loads(response.content)
+                logger.info(
+                    f"Quote received: {quote.get('inAmount')} -> {quote.get('outAmount')} "
+                    f"(impact: {quote.get('priceImpactPct', 'N/A')}%)"
+                )
+                return quote
+            else:
+                error_detail = response.text
+                logger.error(
+                    f"Jupiter quote failed: {response.status_code} - {error_detail}"
+                )
+                raise JupiterServiceException(
+                    f"Failed to get quote from Jupiter (status {response.status_code})",
+                    details={"status_code": response.status_code, "error": error_detail}
                 )
-                
-                if response.status_code == 200:
-                    quote = response.json()
-                    logger.info(
-                        f"Quote received: {quote.get('inAmount')} -> {quote.get('outAmount')} "
-                        f"(impact: {quote.get('priceImpactPct', 'N/A')}%)"
-                    )
-                    return quote
-                else:
-                    error_detail = response.text
-                    logger.error(
-                        f"Jupiter quote failed: {response.status_code} - {error_detail}"
-                    )
-                    raise JupiterServiceException(
-                        f"Failed to get quote from Jupiter (status {response.status_code})",
-                        details={"status_code": response.status_code, "error": error_detail}
-                    )
         
         except ValidationException:
             raise
@@ -262,35 +265,35 @@ class JupiterService:
             logger.info(f"Building swap transaction for user: {user_public_key[:8]}...")
             
             # Make API request
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.api_url}/swap",
-                    json=request_body,
-                    headers=self._get_headers()
-                )
+            response = await get_http_client().post(
+                f"{self.api_url}/swap",
+                json=request_body,
+                headers=self._get_headers(),
+                timeout=self.timeout
+            )
+            
+            if response.status_code == 200:
+                swap_response = orjson.loads(response.content)
+                transaction = swap_response.get("swapTransaction")
                 
-                if response.status_code == 200:
-                    swap_response = response.json()
-                    transaction = swap_response.get("swapTransaction")
-                    
-                    if transaction:
-                        logger.info("Swap transaction built successfully")
-                        return transaction
-                    else:
-                        logger.error("No transaction in Jupiter response")
-                        raise JupiterServiceException(
-                            "No transaction returned from Jupiter",
-                            details={"response": swap_response}
-                        )
+                if transaction:
+                    logger.info("Swap transaction built successfully")
+                    return transaction
                 else:
-                    error_detail = response.text
-                    logger.error(
-                        f"Jupiter swap failed: {response.status_code} - {error_detail}"
-                    )
+                    logger.error("No transaction in Jupiter response")
                     raise JupiterServiceException(
-                        f"Failed to build swap transaction (status {response.status_code})",
-                        details={"status_code": response.status_code, "error": error_detail}
+                        "No transaction returned from Jupiter",
+                        details={"response": swap_response}
                     )
+            else:
+                error_detail = response.text
+                logger.error(
+                    f"Jupiter swap failed: {response.status_code} - {error_detail}"
+                )
+                raise JupiterServiceException(
+                    f"Failed to build swap transaction (status {response.status_code})",
+                    details={"status_code": response.status_code, "error": error_detail}
+                )
         
         except ValidationException:
             raise
@@ -316,28 +319,26 @@ class JupiterService:
             True if API is healthy, False otherwise
         """
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                # Try to get a simple quote
-                response = await client.get(
-                    f"{self.api_url}/quote",
-                    params={
-                        "inputMint": "So11111111111111111111111111111111111111112",
-                        "outputMint": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
-                        "amount": "1000000000",
-                        "slippageBps": "50"
-                    },
-                    headers=self._get_headers()
-                )
-                return response.status_code == 200
+            # Try to get a simple quote
+            response = await get_http_client().get(
+                f"{self.api_url}/quote",
+                params={
+                    "inputMint": "So11111111111111111111111111111111111111112",
+                    "outputMint": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+                    "amount": "1000000000",
+                    "slippageBps": "50"
+                },
+                headers=self._get_headers(),
+                timeout=5.0
+            )
+            return response.status_code == 200
         except Exception as e:
             logger.warning(f"Jupiter health check failed: {e}")
             return False
 
 
 # Singleton instance
-_service: Optional[JupiterService] = None
-
-
+@lru_cache(maxsize=1)
 def get_jupiter_service() -> JupiterService:
     """Get or create the Jupiter service singleton instance.
     
@@ -348,7 +349,4 @@ def get_jupiter_service() -> JupiterService:
         >>> service = get_jupiter_service()
         >>> quote = await service.get_quote(...)
     """
-    global _service
-    if _service is None:
-        _service = JupiterService()
-    return _service
+    return JupiterService()
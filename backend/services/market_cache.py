@@ -0,0 +1,263 @@
+"""Tiered cache for external market data.
+
+DexScreener allows ~300 requests per minute, so every user refresh cannot
+go upstream. This module provides a two-tier cache in front of the market
+data fetchers:
+
+- L1: in-process dictionary with a short TTL (default 10 seconds)
+- L2: optional Redis instance shared between workers (default 60 seconds)
+
+Concurrent misses for the same key are collapsed into a single upstream
+request (single-flight), and TTLs are jittered by +/-10% so entries created
+together do not all expire at the same moment.
+
+Environment Variables:
+    REDIS_URL: Redis connection URL for the L2 tier (optional).
+               When unset, only the in-process tier is used. The L2 tier
+               also needs the ``redis`` package, which is not part of
+               requirements.txt (``pip install redis``).
+"""
+
+import os
+import time
+import random
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+import orjson
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+# Sentinel for "not in cache" so that None can be cached as a negative result
+_MISSING = object()
+
+
+class CachedMarket:
+    """Two-tier TTL cache with single-flight refreshes.
+
+    Keys are tuples such as ``("dex", token_address)`` or
+    ``("gt", pair_address, timeframe)``. Values must be JSON-serializable
+    so they can be stored in Redis.
+
+    Attributes:
+        l1_ttl: Base TTL for in-process entries (seconds)
+        l2_ttl: Base TTL for Redis entries (seconds)
+        jitter: Relative TTL jitter (0.1 = +/-10%)
+        max_entries: Soft limit on in-process entries before expired ones are purged
+        negative_ttl: TTL for cached None (failed) results; defaults to l1_ttl
+    """
+
+    def __init__(
+        self,
+        l1_ttl: float = 10.0,
+        l2_ttl: float = 60.0,
+        jitter: float = 0.1,
+        max_entries: int = 10_000,
+        redis_url: Optional[str] = None,
+        negative_ttl: Optional[float] = None
+    ):
+        self.l1_ttl = l1_ttl
+        self.l2_ttl = l2_ttl
+        self.jitter = jitter
+        self.max_entries = max_entries
+        self.negative_ttl = l1_ttl if negative_ttl is None else negative_ttl
+
+        # Private RNG for TTL jitter instead of the module-level random state
+        self._rng = random.Random()
+
+        self._l1: Dict[Hashable, Tuple[float, Any]] = {}
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        # Coroutines holding or waiting on each lock; it is dropped at zero
+        self._lock_refs: Dict[Hashable, int] = {}
+
+        self._redis = None
+        redis_url = redis_url or os.environ.get('REDIS_URL')
+        if redis_url:
+            if aioredis is None:
+                logger.warning(
+                    "REDIS_URL set but the redis package is not installed. "
+                    "Using in-process market cache only."
+                )
+            else:
+                self._redis = aioredis.from_url(redis_url)
+
+    def _jittered(self, ttl: float) -> float:
+        """Spread a TTL by +/-jitter to avoid synchronized expiry."""
+        return ttl * self._rng.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _l1_get(self, key: Hashable) -> Any:
+        entry = self._l1.get(key)
+        if entry is None:
+            return _MISSING
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._l1.pop(key, None)
+            return _MISSING
+        return value
+
+    def _l1_set(self, key: Hashable, value: Any) -> None:
+        if len(self._l1) >= self.max_entries:
+            now = time.monotonic()
+            for stale in [k for k, (exp, _) in self._l1.items() if exp < now]:
+                del self._l1[stale]
+
+        ttl = self.l1_ttl if value is not None else self.negative_ttl
+        self._l1[key] = (time.monotonic() + self._jittered(ttl), value)
+
+    @staticmethod
+    def _redis_key(key: Hashable) -> str:
+        parts = key if isinstance(key, tuple) else (key,)
+        return "market:" + ":".join(str(p) for p in parts)
+
+    async def _l2_get(self, key: Hashable) -> Any:
+        if self._redis is None:
+            return _MISSING
+
+        try:
+            raw = await self._redis.get(self._redis_key(key))
+        except Exception as e:
+            logger.warning(f"Redis read failed for {key}: {e}")
+            return _MISSING
+
+        return _MISSING if raw is None else orjson.loads(raw)
+
+    async def _l2_set(self, key: Hashable, value: Any) -> None:
+        if self._redis is None:
+            return
+
+        try:
+            await self._redis.set(
+                self._redis_key(key),
+                orjson.dumps(value),
+                ex=max(1, int(self._jittered(self.l2_ttl)))
+            )
+        except Exception as e:
+            logger.warning(f"Redis write failed for {key}: {e}")
+
+    def peek(self, key: Hashable) -> Tuple[bool, Any]:
+        """Look up ``key`` in the in-process tier only, without fetching.
+
+        Returns:
+            Tuple (hit, value); value may be a cached None (negative) result
+        """
+        value = self._l1_get(key)
+        if value is _MISSING:
+            return False, None
+        return True, value
+
+    async def get_or_fetch(
+        self,
+        key: Hashable,
+        fetcher: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return the cached value for ``key``, fetching it on a miss.
+
+        Only one coroutine per key runs ``fetcher`` at a time; the others
+        wait on the same lock and are served from L1 once it completes.
+        A ``None`` result is cached in L1 only, for ``negative_ttl`` seconds.
+
+        Args:
+            key: Cache key
+            fetcher: Coroutine factory that loads the value upstream
+
+        Returns:
+            Cached or freshly fetched value (may be None)
+        """
+        value = self._l1_get(key)
+        if value is not _MISSING:
+            return value
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._lock_refs[key] = self._lock_refs.get(key, 0) + 1
+        try:
+            async with lock:
+                # Another coroutine may have filled the entry while we waited
+                value = self._l1_get(key)
+                if value is not _MISSING:
+                    return value
+
+                value = await self._l2_get(key)
+                if value is _MISSING:
+                    value = await fetcher()
+                    if value is not None:
+                        await self._l2_set(key, value)
+
+                self._l1_set(key, value)
+                return value
+        finally:
+            refs = self._lock_refs[key] - 1
+            if refs:
+                self._lock_refs[key] = refs
+            else:
+                # No waiters left: a new lock for this key cannot split the flight
+                del self._lock_refs[key]
+                self._locks.pop(key, None)
+
+    async def get_many_or_fetch(
+        self,
+        keys: List[Hashable],
+        fetch_many: Callable[[List[Hashable]], Awaitable[List[Any]]]
+    ) -> List[Any]:
+        """Resolve several keys, loading every miss with one batched fetch.
+
+        Unlike get_or_fetch this does not take per-key locks; it is meant
+        for bulk lookups where one upstream batch request replaces N calls.
+
+        Args:
+            keys: Cache keys
+            fetch_many: Coroutine factory taking the missing keys and
+                        returning their values in the same order
+
+        Returns:
+            Values in the same order as ``keys`` (None where unavailable)
+        """
+        values = [self._l1_get(key) for key in keys]
+
+        missing = []
+        for i, key in enumerate(keys):
+            if values[i] is _MISSING:
+                values[i] = await self._l2_get(key)
+                if values[i] is _MISSING:
+                    missing.append(i)
+                else:
+                    self._l1_set(key, values[i])
+
+        if missing:
+            fetched = await fetch_many([keys[i] for i in missing])
+            for i, value in zip(missing, fetched):
+                if value is not None:
+                    await self._l2_set(keys[i], value)
+                self._l1_set(keys[i], value)
+                values[i] = value
+
+        return values
+
+    async def refresh(
+        self,
+        key: Hashable,
+        fetcher: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Fetch ``key`` upstream and overwrite both tiers, ignoring TTLs.
+
+        Used by background warmers to renew hot entries before they expire.
+        A failed fetch (None) leaves the existing entry in place.
+
+        Args:
+            key: Cache key
+            fetcher: Coroutine factory that loads the value upstream
+
+        Returns:
+            Freshly fetched value (may be None)
+        """
+        value = await fetcher()
+        if value is not None:
+            await self._l2_set(key, value)
+            self._l1_set(key, value)
+        return value
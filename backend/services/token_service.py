@@ -19,18 +19,26 @@ Documentation:
 
 import os
 import httpx
+import orjson
 import logging
+import numpy as np
 import asyncio
+from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime, timezone
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Awaitable, Callable
 
 # Solana blockchain libraries
 from solders.pubkey import Pubkey
 from solana.rpc.async_api import AsyncClient
 from solana.rpc.commitment import Confirmed
-from solana.rpc.types import TokenAccountOpts
+from spl.token.constants import TOKEN_PROGRAM_ID, TOKEN_2022_PROGRAM_ID
 
-from utils.exceptions import TokenServiceException, ExternalAPIException
+from services.balance_stream import BalanceStream
+from services.http_client import get_http_client
+from services.market_cache import CachedMarket
+from utils.circuit_breaker import CircuitBreaker
+from utils.exceptions import TokenServiceException, ExternalAPIException, ValidationException
 from utils.validators import validate_solana_address
 
 logger = logging.getLogger(__name__)
@@ -38,6 +46,36 @@ logger = logging.getLogger(__name__)
 # Native SOL token mint address
 SOL_MINT = "So11111111111111111111111111111111111111112"
 
+# Batas request paralel ke tiap provider, dan breaker agar provider yang
+# sedang down langsung gagal cepat alih-alih menunggu timeout penuh
+_DEX_SEM = asyncio.Semaphore(32)
+_HELIUS_SEM = asyncio.Semaphore(32)
+_DEX_BREAKER = CircuitBreaker("DexScreener")
+_HELIUS_BREAKER = CircuitBreaker("Helius")
+
+
+@dataclass(slots=True, frozen=True)
+class TokenMeta:
+    """Static token metadata.
+
+    Slotted and immutable so large token lists stay compact in memory.
+    """
+    address: str
+    symbol: str
+    name: str
+    decimals: int
+    logoURI: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the metadata as a plain dict (API response shape)."""
+        return {
+            "address": self.address,
+            "symbol": self.symbol,
+            "name": self.name,
+            "decimals": self.decimals,
+            "logoURI": self.logoURI,
+        }
+
 
 class TokenService:
     """Service for managing Solana token operations.
@@ -51,8 +89,23 @@ class TokenService:
     Attributes:
         helius_rpc_url: Helius RPC endpoint URL
         client: Async Solana RPC client
-        default_tokens: Dictionary of pre-configured popular tokens
+        default_tokens: Mapping of mint address to TokenMeta for popular tokens
     """
+
+    # Per-request timeouts, built once instead of on every call
+    _TIMEOUT_DEX = httpx.Timeout(5.0)
+    _TIMEOUT_RPC = httpx.Timeout(3.0)
+    _TIMEOUT_CHART = httpx.Timeout(10.0)
+
+    # Refresh period for the default-token warmer; kept below the L1 TTL
+    # (10s +/- 10% jitter) so hot entries are renewed before they expire
+    _WARM_INTERVAL = 8.0
+
+    # Tunggu DexScreener selama ini sebelum ikut meminta Helius (detik)
+    _HELIUS_HEDGE_DELAY = 0.25
+
+    # Jendela penggabungan request saldo per wallet (detik)
+    _BALANCE_BATCH_WINDOW = 0.01
     
     def __init__(self):
         """Initialize Token Service.
@@ -60,6 +113,10 @@ class TokenService:
         Environment Variables:
             HELIUS_RPC_URL: Helius RPC endpoint (required for best performance)
                           Falls back to public Solana node if not set.
+            HELIUS_WS_URL: WebSocket RPC endpoint for balance subscriptions
+                          Derived from HELIUS_RPC_URL if not set.
+            PREFETCH_TOKENS: Comma-separated mint addresses kept warm in the
+                          cache alongside the default tokens (optional).
         
         Example:
             HELIUS_RPC_URL="https://mainnet.helius-rpc.com/?api-key=YOUR_KEY"
@@ -73,49 +130,98 @@ class TokenService:
                 "Performance may be limited. Get Helius key at: https://www.helius.dev"
             )
 
+        # WebSocket endpoint (same host, ws/wss scheme)
+        self.ws_url = os.environ.get('HELIUS_WS_URL') or self.helius_rpc_url.replace("https://", "wss://", 1).replace("http://", "ws://", 1)
+
         # Initialize Solana RPC client
         self.client = AsyncClient(self.helius_rpc_url, commitment=Confirmed)
+
+        # Shared accountSubscribe stream for balance push updates
+        self._balance_stream = BalanceStream(self.ws_url)
+
+        # Pooled HTTP/2 client shared with the other services
+        self._http = get_http_client()
+
+        # L1/L2 cache in front of DexScreener and GeckoTerminal
+        self._market_cache = CachedMarket()
+
+        # Static asset metadata (name/symbol/logo) rarely changes, so it is
+        # kept much longer; failed lookups are retried after 30s
+        self._asset_cache = CachedMarket(l1_ttl=300.0, l2_ttl=3600.0, negative_ttl=30.0)
+        self._warmer_task: Optional[asyncio.Task] = None
+
+        # In-flight metadata lookups, so concurrent callers share one fetch
+        self._metadata_inflight: Dict[str, asyncio.Task] = {}
+
+        # In-flight token account lookups per wallet (balance micro-batching)
+        self._token_accounts_inflight: Dict[str, asyncio.Task] = {}
         
         # Pre-configured popular tokens with static metadata
         # This provides fallback data and improves response time
-        self.default_tokens = {
-            SOL_MINT: {
-                "address": SOL_MINT,
-                "symbol": "SOL",
-                "name": "Solana",
-                "decimals": 9,
-                "logoURI": "https://raw.githubusercontent.com/solana-labs/token-list/main/assets/mainnet/So11111111111111111111111111111111111111112/logo.png",
-            },
-            "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v": {
-                "address": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
-                "symbol": "USDC",
-                "name": "USD Coin",
-                "decimals": 6,
-                "logoURI": "https://raw.githubusercontent.com/solana-labs/token-list/main/assets/mainnet/EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v/logo.png",
-            },
-            "Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB": {
-                "address": "Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB",
-                "symbol": "USDT",
-                "name": "USDT",
-                "decimals": 6,
-                "logoURI": "https://raw.githubusercontent.com/solana-labs/token-list/main/assets/mainnet/Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB/logo.png",
-            },
+        self.default_tokens: Dict[str, TokenMeta] = {token.address: token for token in (
+            TokenMeta(
+                address=SOL_MINT,
+                symbol="SOL",
+                name="Solana",
+                decimals=9,
+                logoURI="https://raw.githubusercontent.com/solana-labs/token-list/main/assets/mainnet/So11111111111111111111111111111111111111112/logo.png",
+            ),
+            TokenMeta(
+                address="EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+                symbol="USDC",
+                name="USD Coin",
+                decimals=6,
+                logoURI="https://raw.githubusercontent.com/solana-labs/token-list/main/assets/mainnet/EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v/logo.png",
+            ),
+            TokenMeta(
+                address="Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB",
+                symbol="USDT",
+                name="USDT",
+                decimals=6,
+                logoURI="https://raw.githubusercontent.com/solana-labs/token-list/main/assets/mainnet/Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB/logo.png",
+            ),
             # User's TEKRA tokens
-            "4ymWDE5kwxZ5rxN3mWLvJEBHESbZSiqBuvWmSVcGqZdj": {
-                "address": "4ymWDE5kwxZ5rxN3mWLvJEBHESbZSiqBuvWmSVcGqZdj",
-                "symbol": "TEKRA",
-                "name": "TEKRA Token 1",
-                "decimals": 9,
-                "logoURI": None,
-            },
-            "FShCGqGUWRZkqovteJBGegUJAcjRzHZiBmHYGgSqpump": {
-                "address": "FShCGqGUWRZkqovteJBGegUJAcjRzHZiBmHYGgSqpump",
-                "symbol": "TEKRA",
-                "name": "TEKRA Token 2",
-                "decimals": 9,
-                "logoURI": None,
-            }
-        }
+            TokenMeta(
+                address="4ymWDE5kwxZ5rxN3mWLvJEBHESbZSiqBuvWmSVcGqZdj",
+                symbol="TEKRA",
+                name="TEKRA Token 1",
+                decimals=9,
+                logoURI=None,
+            ),
+            TokenMeta(
+                address="FShCGqGUWRZkqovteJBGegUJAcjRzHZiBmHYGgSqpump",
+                symbol="TEKRA",
+                name="TEKRA Token 2",
+                decimals=9,
+                logoURI=None,
+            ),
+        )}
+
+        # Tokens prefetched at startup and kept warm by the background refresher
+        self.watchlist: List[str] = list(self.default_tokens)
+        for address in os.environ.get('PREFETCH_TOKENS', '').split(','):
+            address = address.strip()
+            if not address or address in self.default_tokens:
+                continue
+            try:
+                self.watchlist.append(validate_solana_address(address, "PREFETCH_TOKENS"))
+            except ValidationException:
+                logger.warning(f"Ignoring invalid PREFETCH_TOKENS entry: {address}")
+
+        # Token list response is static, so serialize it once
+        self._token_list_json = orjson.dumps(
+            [token.to_dict() for token in self.default_tokens.values()]
+        )
+
+        # Warm the Pubkey cache for the mints we query most often
+        for address in self.default_tokens:
+            self._pk(address)
+
+    @staticmethod
+    @lru_cache(maxsize=8192)
+    def _pk(address: str) -> Pubkey:
+        """Decode a base58 address into a Pubkey, caching the result."""
+        return Pubkey.from_string(address)
 
     async def get_token_list(self) -> List[Dict[str, Any]]:
         """Get list of default/popular tokens.
@@ -137,40 +243,233 @@ class TokenService:
             >>> print(tokens[0]['symbol'])
             'SOL'
         """
-        return list(self.default_tokens.values())
+        return [token.to_dict() for token in self.default_tokens.values()]
+
+    def get_token_list_json(self) -> bytes:
+        """Get the default token list pre-serialized as JSON bytes.
+
+        Same content as get_token_list(), encoded once at startup so the
+        list endpoint can return it without re-serializing.
+        """
+        return self._token_list_json
+
+    @staticmethod
+    async def _guarded(
+        breaker: CircuitBreaker,
+        semaphore: asyncio.Semaphore,
+        request: Callable[[], Awaitable[httpx.Response]],
+        validate: Optional[Callable[[httpx.Response], bool]] = None
+    ) -> httpx.Response:
+        """Run an HTTP request through the provider's semaphore and circuit breaker.
+
+        Transport errors, 429 and 5xx responses count as failures, as do
+        responses rejected by ``validate`` when it is given.
+
+        Raises:
+            ExternalAPIException: If the circuit is open (no request is sent)
+            httpx.HTTPError: If the request fails at the transport level
+        """
+        is_probe = breaker.check()
+        try:
+            async with semaphore:
+                response = await request()
+        except httpx.HTTPError:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancelled or failed before an outcome: free the half-open slot
+            if is_probe:
+                breaker.cancel_probe()
+            raise
+
+        if (
+            response.status_code == 429 or response.status_code >= 500
+            or (validate is not None and not validate(response))
+        ):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
 
     async def _fetch_dexscreener_data(self, token_address: str) -> Optional[Dict]:
-        """Helper untuk mengambil data real-time dari DexScreener"""
+        """Helper untuk mengambil data real-time dari DexScreener (cached)"""
+        return await self._market_cache.get_or_fetch(
+            ("dex", token_address),
+            lambda: self._request_dexscreener_data(token_address)
+        )
+
+    async def _request_dexscreener_data(self, token_address: str) -> Optional[Dict]:
+        """Request data real-time dari DexScreener tanpa cache"""
         try:
-            async with httpx.AsyncClient(timeout=5.0) as http_client:
-                url = f"https://api.dexscreener.com/latest/dex/tokens/{token_address}"
-                response = await http_client.get(url)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get("pairs"):
-                        # Ambil pair dengan likuiditas tertinggi
-                        # Filter pair yang di Solana saja
-                        pairs = [p for p in data["pairs"] if p.get("chainId") == "solana"]
-                        if not pairs:
-                            return None
-                            
-                        pair = pairs[0] # Pair terbesar
-                        return {
-                            "price_usd": float(pair.get("priceUsd", 0)),
-                            "volume_24h": float(pair.get("volume", {}).get("h24", 0)),
-                            "market_cap": float(pair.get("fdv", 0) or pair.get("marketCap", 0)),
-                            "pair_address": pair.get("pairAddress"), # PENTING UNTUK CHART
-                            "pair_info": pair
-                        }
+            url = f"https://api.dexscreener.com/latest/dex/tokens/{token_address}"
+            response = await self._guarded(
+                _DEX_BREAKER, _DEX_SEM,
+                lambda: self._http.get(url, timeout=self._TIMEOUT_DEX)
+            )
+            
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                # Ambil pair Solana dengan likuiditas tertinggi (satu pass, tanpa list sementara)
+                pair = None
+                best_liquidity = -1.0
+                for p in data.get("pairs") or ():
+                    if p.get("chainId") != "solana":
+                        continue
+                    liquidity = (p.get("liquidity") or {}).get("usd") or 0
+                    if liquidity > best_liquidity:
+                        best_liquidity, pair = liquidity, p
+
+                if pair is not None:
+                    return {
+                        "price_usd": float(pair.get("priceUsd", 0)),
+                        "volume_24h": float(pair.get("volume", {}).get("h24", 0)),
+                        "market_cap": float(pair.get("fdv", 0) or pair.get("marketCap", 0)),
+                        "pair_address": pair.get("pairAddress"), # PENTING UNTUK CHART
+                        "pair_info": pair
+                    }
         except Exception as e:
             logger.warning(f"DexScreener fetch failed for {token_address}: {e}")
         return None
 
+    async def _warmer(self) -> None:
+        """Prefetch the watchlist, then keep its DexScreener data hot in the cache."""
+        # One batched prefetch at startup also fills the Helius asset cache
+        try:
+            await self.get_token_metadata_many(self.watchlist)
+        except Exception as e:
+            logger.warning(f"Watchlist prefetch failed: {e}")
+
+        while True:
+            await asyncio.sleep(self._WARM_INTERVAL)
+            await asyncio.gather(
+                *(
+                    self._market_cache.refresh(
+                        ("dex", address),
+                        lambda address=address: self._request_dexscreener_data(address)
+                    )
+                    for address in self.watchlist
+                ),
+                return_exceptions=True
+            )
+
+    def start_background_tasks(self) -> None:
+        """Start the cache warmer. Must be called from a running event loop."""
+        if self._warmer_task is None:
+            self._warmer_task = asyncio.create_task(self._warmer())
+
+    async def stop_background_tasks(self) -> None:
+        """Cancel the cache warmer."""
+        if self._warmer_task is not None:
+            self._warmer_task.cancel()
+            try:
+                await self._warmer_task
+            except asyncio.CancelledError:
+                pass
+            self._warmer_task = None
+
+    async def close(self) -> None:
+        """Stop background work and close RPC connections."""
+        await self.stop_background_tasks()
+        await self._balance_stream.close()
+        await self.client.close()
+
     async def get_token_metadata(self, token_address: str) -> Dict:
         """
         Menggabungkan Metadata Statis (Nama/Logo) dengan Data Dinamis (Harga).
+
+        Request bersamaan untuk mint yang sama digabung (singleflight):
+        hanya satu yang benar-benar fetch, sisanya menunggu hasil yang sama.
+        """
+        task = self._metadata_inflight.get(token_address)
+        if task is None:
+            task = asyncio.ensure_future(self._build_token_metadata(token_address))
+            self._metadata_inflight[token_address] = task
+            task.add_done_callback(lambda _: self._metadata_inflight.pop(token_address, None))
+
+        # shield: caller yang dibatalkan tidak ikut membatalkan caller lain
+        return dict(await asyncio.shield(task))
+
+    async def _build_token_metadata(self, token_address: str) -> Dict:
+        """Susun metadata satu token (dipanggil lewat get_token_metadata).
+
+        Untuk token non-default yang data DexScreener-nya belum ada di cache,
+        Helius baru dimulai jika DexScreener belum menjawab dalam
+        _HELIUS_HEDGE_DELAY detik (hedged request). Jika DexScreener punya
+        data, request Helius dibatalkan; jika tidak, hasil Helius dipakai.
+        """
+        # Token default tidak butuh fallback Helius
+        if token_address in self.default_tokens:
+            market_data = await self._fetch_dexscreener_data(token_address)
+            return self._merge_metadata(token_address, market_data, None)
+
+        # Cache hit: tidak perlu balapan dengan Helius
+        hit, market_data = self._market_cache.peek(("dex", token_address))
+        if hit:
+            return await self._merge_with_fallback(token_address, market_data)
+
+        dex_task = asyncio.ensure_future(self._fetch_dexscreener_data(token_address))
+        asset_task = None
+        try:
+            done, _ = await asyncio.wait({dex_task}, timeout=self._HELIUS_HEDGE_DELAY)
+            if dex_task not in done:
+                # DexScreener lambat: mulai Helius bersamaan
+                asset_task = asyncio.ensure_future(self._fetch_helius_asset(token_address))
+
+            market_data = await dex_task
+            if market_data or asset_task is None:
+                return await self._merge_with_fallback(token_address, market_data)
+
+            # Fallback ke RPC Helius (Metadata Only) yang sudah berjalan
+            return self._merge_metadata(token_address, None, await asset_task)
+        finally:
+            for task in (dex_task, asset_task):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    async def _merge_with_fallback(self, token_address: str, market_data: Optional[Dict]) -> Dict:
+        """Gabungkan data DexScreener, atau fallback ke aset Helius jika kosong."""
+        if market_data:
+            return self._merge_metadata(token_address, market_data, None)
+        return self._merge_metadata(token_address, None, await self._fetch_helius_asset(token_address))
+
+    async def get_token_metadata_many(self, token_addresses: List[str]) -> Dict[str, Dict]:
+        """Ambil metadata banyak token sekaligus.
+
+        Data DexScreener diambil paralel (lewat cache), dan semua token yang
+        perlu fallback Helius diambil dalam SATU JSON-RPC batch request.
+
+        Args:
+            token_addresses: Daftar mint address (duplikat diabaikan)
+
+        Returns:
+            Dict mint address -> metadata (format sama dengan get_token_metadata)
         """
+        addresses = list(dict.fromkeys(token_addresses))
+        market = await asyncio.gather(
+            *(self._fetch_dexscreener_data(address) for address in addresses)
+        )
+
+        need_asset = [
+            address for address, market_data in zip(addresses, market)
+            if not market_data and address not in self.default_tokens
+        ]
+        assets = dict(zip(need_asset, await self._asset_cache.get_many_or_fetch(
+            [("asset", address) for address in need_asset],
+            lambda keys: self._request_helius_assets([key[1] for key in keys])
+        )))
+
+        return {
+            address: self._merge_metadata(address, market_data, assets.get(address))
+            for address, market_data in zip(addresses, market)
+        }
+
+    def _merge_metadata(
+        self,
+        token_address: str,
+        market_data: Optional[Dict],
+        asset: Optional[Dict]
+    ) -> Dict:
+        """Menggabungkan default list, data DexScreener dan aset Helius."""
         # 1. Siapkan Metadata Dasar
         metadata = {
             "address": token_address,
@@ -184,12 +483,11 @@ class TokenService:
         }
 
         # Cek default list
-        if token_address in self.default_tokens:
-            metadata.update(self.default_tokens[token_address])
-
-        # 2. Ambil Harga Real-time (DexScreener)
-        market_data = await self._fetch_dexscreener_data(token_address)
+        default_token = self.default_tokens.get(token_address)
+        if default_token is not None:
+            metadata.update(default_token.to_dict())
 
+        # 2. Harga Real-time (DexScreener)
         if market_data:
             metadata["price_per_token"] = market_data["price_usd"]
             metadata["volume_24h"] = market_data["volume_24h"]
@@ -205,38 +503,143 @@ class TokenService:
                 
             return metadata
 
-        # 3. Fallback ke RPC Helius (Metadata Only)
-        if metadata["symbol"] == "UNK":
-            try:
-                async with httpx.AsyncClient(timeout=3.0) as http_client:
-                    response = await http_client.post(
-                        self.helius_rpc_url,
-                        json={
-                            "jsonrpc": "2.0", "id": "metadata", 
-                            "method": "getAsset", "params": {"id": token_address}
-                        }
-                    )
-                    if response.status_code == 200:
-                        data = response.json()
-                        if "result" in data:
-                            content = data["result"].get("content", {})
-                            token_info = data["result"].get("token_info", {})
-                            
-                            metadata["name"] = content.get("metadata", {}).get("name", "Unknown")
-                            metadata["symbol"] = content.get("metadata", {}).get("symbol", "UNK")
-                            metadata["decimals"] = token_info.get("decimals", 9)
-                            metadata["logoURI"] = content.get("links", {}).get("image")
-            except Exception:
-                pass
+        # 3. Metadata dari Helius
+        if metadata["symbol"] == "UNK" and asset:
+            metadata.update(asset)
 
         return metadata
 
+    async def _fetch_helius_asset(self, token_address: str) -> Optional[Dict]:
+        """Helper metadata statis dari Helius DAS getAsset (cached)"""
+        return await self._asset_cache.get_or_fetch(
+            ("asset", token_address),
+            lambda: self._request_helius_asset(token_address)
+        )
+
+    async def _request_helius_asset(self, token_address: str) -> Optional[Dict]:
+        """Request Helius DAS getAsset tanpa cache.
+
+        Returns:
+            Dict berisi name, symbol, decimals, logoURI, atau None jika gagal
+        """
+        try:
+            response = await self._guarded(
+                _HELIUS_BREAKER, _HELIUS_SEM,
+                lambda: self._http.post(
+                    self.helius_rpc_url,
+                    content=orjson.dumps({
+                        "jsonrpc": "2.0", "id": "metadata", 
+                        "method": "getAsset", "params": {"id": token_address}
+                    }),
+                    headers={"content-type": "application/json"},
+                    timeout=self._TIMEOUT_RPC
+                )
+            )
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                if "result" in data:
+                    return self._parse_helius_asset(data["result"])
+        except Exception as e:
+            logger.warning(f"Helius getAsset failed for {token_address}: {e}")
+        return None
+
+    async def _request_helius_assets(self, token_addresses: List[str]) -> List[Optional[Dict]]:
+        """Request getAsset untuk banyak token dalam satu JSON-RPC batch."""
+        try:
+            results = await self._rpc_batch(
+                [("getAsset", {"id": address}) for address in token_addresses]
+            )
+        except Exception as e:
+            logger.warning(f"Helius getAsset batch failed for {len(token_addresses)} tokens: {e}")
+            return [None] * len(token_addresses)
+
+        return [self._parse_helius_asset(result) if result else None for result in results]
+
+    @staticmethod
+    def _parse_helius_asset(result: Dict) -> Dict:
+        content = result.get("content", {})
+        token_info = result.get("token_info", {})
+        
+        return {
+            "name": content.get("metadata", {}).get("name", "Unknown"),
+            "symbol": content.get("metadata", {}).get("symbol", "UNK"),
+            "decimals": token_info.get("decimals", 9),
+            "logoURI": content.get("links", {}).get("image")
+        }
+
+    async def _rpc_batch(self, calls: List[tuple]) -> List[Optional[Any]]:
+        """Kirim beberapa JSON-RPC call ke Helius dalam satu POST.
+
+        Args:
+            calls: List (method, params)
+
+        Returns:
+            List result sesuai urutan calls (None untuk call yang error)
+
+        Raises:
+            httpx.HTTPError: Jika request batch gagal
+            ExternalAPIException: Jika circuit Helius sedang terbuka, atau
+                batch dibalas dengan objek error alih-alih array
+        """
+        if not calls:
+            return []
+
+        body = orjson.dumps([
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, (method, params) in enumerate(calls)
+        ])
+        response = await self._guarded(
+            _HELIUS_BREAKER, _HELIUS_SEM,
+            lambda: self._http.post(
+                self.helius_rpc_url,
+                content=body,
+                headers={"content-type": "application/json"},
+                timeout=self._TIMEOUT_RPC
+            ),
+            # Batch yang ditolak (rate limit, plan tanpa batch) dibalas dengan
+            # satu objek error, bukan array
+            validate=lambda r: r.content.lstrip()[:1] == b"["
+        )
+        response.raise_for_status()
+
+        payload = orjson.loads(response.content)
+        if not isinstance(payload, list):
+            error = payload.get("error") if isinstance(payload, dict) else payload
+            raise ExternalAPIException(
+                "Helius", "batch request rejected", details={"error": error}
+            )
+
+        # Response batch boleh datang dalam urutan apa pun: demultiplex by id
+        results: List[Optional[Any]] = [None] * len(calls)
+        for item in payload:
+            i = item.get("id")
+            if isinstance(i, int) and 0 <= i < len(calls):
+                results[i] = item.get("result")
+        return results
+
     async def get_token_balance(self, wallet: str, mint: str):
-        """Mendapatkan saldo token dengan parsing JSON yang benar"""
+        """Mendapatkan saldo token dengan parsing JSON yang benar.
+
+        Jika (wallet, mint) sedang di-subscribe lewat subscribe_balance,
+        saldo terakhir dari stream dipakai tanpa RPC.
+        """
+        streamed = self._balance_stream.latest.get((wallet, mint))
+        if streamed is not None:
+            return dict(streamed)
+
+        balance, _ = await self._fetch_token_balance(wallet, mint)
+        return balance
+
+    async def _fetch_token_balance(self, wallet: str, mint: str):
+        """Ambil saldo via RPC.
+
+        Returns:
+            Tuple (balance dict, alamat akun yang menyimpan saldo atau None)
+        """
         try:
-            if not wallet or len(wallet) < 30: return {"balance": 0, "uiAmount": 0, "decimals": 0}
+            if not wallet or len(wallet) < 30: return {"balance": 0, "uiAmount": 0, "decimals": 0}, None
             
-            pubkey = Pubkey.from_string(wallet)
+            pubkey = self._pk(wallet)
 
             # KASUS A: Token Native (SOL)
             if mint == SOL_MINT: 
@@ -246,35 +649,116 @@ class TokenService:
                     "balance": val,
                     "uiAmount": val / 1e9,
                     "decimals": 9
-                }
+                }, wallet
             
-            # KASUS B: Token SPL
-            mint_pubkey = Pubkey.from_string(mint)
-            resp = await self.client.get_token_accounts_by_owner(
-                pubkey, 
-                TokenAccountOpts(mint=mint_pubkey, encoding="jsonParsed")
-            )
+            # KASUS B: Token SPL (semua akun wallet diambil sekali, lalu dipilih per mint)
+            holding = (await self._get_token_accounts(wallet)).get(mint)
+            if holding is not None:
+                account, balance = holding
+                return dict(balance), account
             
-            if resp.value:
-                acc_data = resp.value[0].account.data
-                parsed_data = acc_data.parsed if hasattr(acc_data, 'parsed') else acc_data
-                
-                if isinstance(parsed_data, dict):
-                    amount_info = parsed_data['info']['tokenAmount']
-                else:
-                    amount_info = parsed_data.info['tokenAmount']
-
-                return {
-                    "balance": float(amount_info['amount']),
-                    "uiAmount": float(amount_info['uiAmount']),
-                    "decimals": int(amount_info['decimals'])
-                }
-            
-            return {"balance": 0, "uiAmount": 0, "decimals": 0}
+            return {"balance": 0, "uiAmount": 0, "decimals": 0}, None
 
         except Exception as e:
             logger.error(f"Error fetching balance: {e}")
-            return {"balance": 0, "uiAmount": 0, "decimals": 0}
+            return {"balance": 0, "uiAmount": 0, "decimals": 0}, None
+
+    async def _get_token_accounts(self, wallet: str) -> Dict[str, tuple]:
+        """Ambil semua token account SPL milik wallet, digabung per wallet.
+
+        Panggilan bersamaan untuk wallet yang sama (dalam jendela 10ms atau
+        selama request masih berjalan) berbagi satu JSON-RPC batch
+        getTokenAccountsByOwner untuk program Token dan Token-2022, sehingga
+        N saldo mint cukup satu round-trip.
+
+        Returns:
+            Dict mint -> (alamat token account, balance dict)
+        """
+        task = self._token_accounts_inflight.get(wallet)
+        if task is None:
+            task = asyncio.ensure_future(self._load_token_accounts(wallet))
+            self._token_accounts_inflight[wallet] = task
+            task.add_done_callback(lambda _: self._token_accounts_inflight.pop(wallet, None))
+
+        return await asyncio.shield(task)
+
+    async def _load_token_accounts(self, wallet: str) -> Dict[str, tuple]:
+        """Request token account wallet setelah jendela batch (dipanggil lewat _get_token_accounts)."""
+        await asyncio.sleep(self._BALANCE_BATCH_WINDOW)
+
+        config = {"encoding": "jsonParsed", "commitment": "confirmed"}
+        results = await self._rpc_batch([
+            ("getTokenAccountsByOwner", [wallet, {"programId": str(program)}, config])
+            for program in (TOKEN_PROGRAM_ID, TOKEN_2022_PROGRAM_ID)
+        ])
+
+        # mint -> [akun pertama (untuk subscribe), total amount, decimals]
+        totals: Dict[str, list] = {}
+        for result in results:
+            for item in (result or {}).get("value") or ():
+                try:
+                    info = item["account"]["data"]["parsed"]["info"]
+                    token_amount = info["tokenAmount"]
+                    amount = int(token_amount["amount"])
+                    decimals = int(token_amount["decimals"])
+                    mint = info["mint"]
+                    pubkey = item["pubkey"]
+                except (KeyError, TypeError, ValueError):
+                    # Akun yang tidak ter-parse (mis. fallback base64) dilewati
+                    continue
+
+                # Mint dengan lebih dari satu akun (ATA + akun tambahan): jumlahkan
+                entry = totals.get(mint)
+                if entry is None:
+                    totals[mint] = [pubkey, amount, decimals]
+                else:
+                    entry[1] += amount
+
+        accounts: Dict[str, tuple] = {
+            mint: (pubkey, {
+                "balance": amount,
+                "uiAmount": amount / 10 ** decimals,
+                "decimals": decimals
+            })
+            for mint, (pubkey, amount, decimals) in totals.items()
+        }
+        return accounts
+
+    async def subscribe_balance(self, wallet: str, mint: str) -> asyncio.Queue:
+        """Subscribe to push updates for a wallet's token balance.
+
+        The balance is fetched once over HTTP, then kept current by an
+        accountSubscribe on the shared WebSocket connection. While the
+        subscription is active, get_token_balance answers from the stream.
+
+        Args:
+            wallet: Wallet address
+            mint: Token mint address
+
+        Returns:
+            Queue receiving balance dicts (first item is the current balance);
+            None is pushed if the stream disconnects.
+
+        Raises:
+            TokenServiceException: If the wallet has no account for this mint
+        """
+        validate_solana_address(wallet, "wallet")
+        validate_solana_address(mint, "mint")
+
+        initial, account = await self._fetch_token_balance(wallet, mint)
+        if account is None:
+            raise TokenServiceException(
+                "No token account to subscribe to",
+                details={"wallet": wallet, "mint": mint}
+            )
+
+        return await self._balance_stream.subscribe(
+            wallet, mint, account, initial, is_native=(mint == SOL_MINT)
+        )
+
+    async def unsubscribe_balance(self, wallet: str, mint: str, queue: asyncio.Queue) -> None:
+        """Stop a subscription created by subscribe_balance."""
+        await self._balance_stream.unsubscribe(wallet, mint, queue)
 
     async def get_wallet_portfolio(self, wallet_address: str) -> Dict:
         """
@@ -284,92 +768,79 @@ class TokenService:
             if not wallet_address or len(wallet_address) < 30:
                 return {"total_usd": 0, "tokens": [], "error": "Invalid wallet address"}
             
-            pubkey = Pubkey.from_string(wallet_address)
+            pubkey = self._pk(wallet_address)
             portfolio_tokens = []
             total_value_usd = 0
             
             # 1. Ambil SOL Balance
+            sol_balance = 0
             try:
                 sol_balance_resp = await self.client.get_balance(pubkey)
                 sol_balance = (sol_balance_resp.value or 0) / 1e9
-                
-                if sol_balance > 0:
-                    sol_metadata = await self.get_token_metadata(SOL_MINT)
-                    sol_price = sol_metadata.get("price_per_token", 0)
-                    sol_value = sol_balance * sol_price
-                    
-                    portfolio_tokens.append({
-                        "address": SOL_MINT,
-                        "symbol": "SOL",
-                        "name": "Solana",
-                        "balance": sol_balance,
-                        "decimals": 9,
-                        "price_usd": sol_price,
-                        "value_usd": sol_value,
-                        "logoURI": sol_metadata.get("logoURI"),
-                        "volume_24h": sol_metadata.get("volume_24h", 0),
-                        "market_cap": sol_metadata.get("market_cap", 0)
-                    })
-                    total_value_usd += sol_value
             except Exception as e:
                 logger.error(f"Error fetching SOL balance: {e}")
             
-            # 2. Ambil semua SPL Token Accounts
+            # 2. Ambil semua SPL Token Accounts: (mint, balance, decimals)
+            holdings = []
             try:
-                # Get all token accounts owned by wallet
-                token_accounts = await self.client.get_token_accounts_by_owner(
-                    pubkey,
-                    TokenAccountOpts(encoding="jsonParsed")
-                )
+                # Get all token accounts owned by wallet (Token + Token-2022)
+                token_accounts = await self._get_token_accounts(wallet_address)
                 
-                # Process each token account
-                for account in token_accounts.value:
-                    try:
-                        acc_data = account.account.data
-                        parsed_data = acc_data.parsed if hasattr(acc_data, 'parsed') else acc_data
-                        
-                        if isinstance(parsed_data, dict):
-                            info = parsed_data['info']
-                        else:
-                            info = parsed_data.info
-                        
-                        mint = info['mint']
-                        token_amount = info['tokenAmount']
-                        balance = float(token_amount['uiAmount'] or 0)
-                        
-                        # Skip jika balance = 0
-                        if balance <= 0:
-                            continue
-                        
-                        # Ambil metadata + harga
-                        metadata = await self.get_token_metadata(mint)
-                        price = metadata.get("price_per_token", 0)
-                        value = balance * price
-                        
-                        portfolio_tokens.append({
-                            "address": mint,
-                            "symbol": metadata.get("symbol", "UNK"),
-                            "name": metadata.get("name", "Unknown"),
-                            "balance": balance,
-                            "decimals": int(token_amount['decimals']),
-                            "price_usd": price,
-                            "value_usd": value,
-                            "logoURI": metadata.get("logoURI"),
-                            "volume_24h": metadata.get("volume_24h", 0),
-                            "market_cap": metadata.get("market_cap", 0)
-                        })
-                        
-                        # Tambahkan ke total BAHKAN jika price = 0
-                        # Karena user mau "sekecil apapun"
-                        total_value_usd += value
-                        
-                    except Exception as e:
-                        logger.error(f"Error processing token account: {e}")
+                for mint, (_, balance) in token_accounts.items():
+                    # Skip jika balance = 0
+                    if balance["uiAmount"] <= 0:
                         continue
+                    
+                    holdings.append((mint, balance["uiAmount"], balance["decimals"]))
                         
             except Exception as e:
                 logger.error(f"Error fetching token accounts: {e}")
             
+            # Ambil metadata + harga semua token sekaligus (satu batch)
+            mints = ([SOL_MINT] if sol_balance > 0 else []) + [mint for mint, _, _ in holdings]
+            metadata_by_mint = await self.get_token_metadata_many(mints)
+            
+            if sol_balance > 0:
+                sol_metadata = metadata_by_mint[SOL_MINT]
+                sol_price = sol_metadata.get("price_per_token", 0)
+                sol_value = sol_balance * sol_price
+                
+                portfolio_tokens.append({
+                    "address": SOL_MINT,
+                    "symbol": "SOL",
+                    "name": "Solana",
+                    "balance": sol_balance,
+                    "decimals": 9,
+                    "price_usd": sol_price,
+                    "value_usd": sol_value,
+                    "logoURI": sol_metadata.get("logoURI"),
+                    "volume_24h": sol_metadata.get("volume_24h", 0),
+                    "market_cap": sol_metadata.get("market_cap", 0)
+                })
+                total_value_usd += sol_value
+            
+            for mint, balance, decimals in holdings:
+                metadata = metadata_by_mint[mint]
+                price = metadata.get("price_per_token", 0)
+                value = balance * price
+                
+                portfolio_tokens.append({
+                    "address": mint,
+                    "symbol": metadata.get("symbol", "UNK"),
+                    "name": metadata.get("name", "Unknown"),
+                    "balance": balance,
+                    "decimals": decimals,
+                    "price_usd": price,
+                    "value_usd": value,
+                    "logoURI": metadata.get("logoURI"),
+                    "volume_24h": metadata.get("volume_24h", 0),
+                    "market_cap": metadata.get("market_cap", 0)
+                })
+                
+                # Tambahkan ke total BAHKAN jika price = 0
+                # Karena user mau "sekecil apapun"
+                total_value_usd += value
+            
             # 3. Sort by value (terbesar dulu)
             portfolio_tokens.sort(key=lambda x: x["value_usd"], reverse=True)
             
@@ -394,13 +865,16 @@ class TokenService:
         """
         Ambil Chart REAL dari GeckoTerminal menggunakan Pair Address dari DexScreener.
         TIDAK ADA LAGI MOCK DATA.
+
+        Data dikembalikan dalam format kolom (NumPy array, diserialisasi oleh
+        ORJSONResponse): {"t": [timestamp ms], "p": [close], "v": [volume]}
         """
         # 1. Cari Pair Address dulu di DexScreener
         market_data = await self._fetch_dexscreener_data(token_address)
         
         if not market_data or not market_data.get("pair_address"):
             logger.warning(f"No pair found for chart: {token_address}")
-            return {"data": [], "current_price": 0, "mock": False}
+            return {"data": {"t": [], "p": [], "v": []}, "current_price": 0, "mock": False}
 
         current_price = market_data["price_usd"]
         pair_address = market_data["pair_address"]
@@ -410,52 +884,72 @@ class TokenService:
         gt_timeframe = "hour" if interval == "1h" else "day"
         limit = 24 if interval == "1h" else 30
 
-        try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                # API GeckoTerminal untuk Solana
-                url = f"https://api.geckoterminal.com/api/v2/networks/solana/pools/{pair_address}/ohlcv/{gt_timeframe}"
-                
-                resp = await client.get(url, params={"limit": limit})
-                
-                if resp.status_code == 200:
-                    data = resp.json()
-                    # Format GeckoTerminal: [time, open, high, low, close, volume]
-                    ohlcv_list = data.get("data", {}).get("attributes", {}).get("ohlcv_list", [])
-                    
-                    chart_data = []
-                    for item in ohlcv_list:
-                        # item = [timestamp, open, high, low, close, volume]
-                        chart_data.append({
-                            "timestamp": int(item[0]) * 1000, # Convert ke ms
-                            "price": float(item[4]),          # Close price
-                            "volume": float(item[5])
-                        })
-                    
-                    # Sort biar urut dari lama ke baru (kadang API return terbalik)
-                    chart_data.sort(key=lambda x: x["timestamp"])
+        ohlcv_list = await self._market_cache.get_or_fetch(
+            ("gt", pair_address, gt_timeframe),
+            lambda: self._request_geckoterminal_ohlcv(pair_address, gt_timeframe, limit)
+        )
 
-                    return {
-                        "data": chart_data,
-                        "current_price": current_price,
-                        "mock": False # Real Data!
-                    }
-                else:
-                    logger.error(f"GeckoTerminal Error: {resp.status_code} - {resp.text}")
+        if ohlcv_list is not None:
+            try:
+                # Baris = [timestamp, open, high, low, close, volume]
+                arr = np.asarray(ohlcv_list, dtype=np.float64).reshape(-1, 6)
 
-        except Exception as e:
-            logger.error(f"Chart fetch error: {e}")
+                # Urutkan dari lama ke baru (kadang API return terbalik), lalu
+                # transpose ke kolom C-contiguous: orjson hanya bisa serialisasi
+                # array contiguous, sedangkan arr[:, i] adalah view bertingkat (strided)
+                cols = np.ascontiguousarray(arr[np.argsort(arr[:, 0], kind="stable")].T)
+
+                return {
+                    "data": {
+                        "t": cols[0].astype(np.int64) * 1000, # Convert ke ms
+                        "p": cols[4],                         # Close price
+                        "v": cols[5]
+                    },
+                    "current_price": current_price,
+                    "mock": False # Real Data!
+                }
+            except (ValueError, TypeError) as e:
+                # Baris tidak lengkap atau berisi null dari GeckoTerminal
+                logger.error(f"Malformed OHLCV data for {pair_address}: {e}")
 
         # Jika gagal fetch chart, return kosong (jangan mock biar user tau errornya)
         return {
-            "data": [],
+            "data": {"t": [], "p": [], "v": []},
             "current_price": current_price,
             "mock": False
         }
 
-# Singleton Instance
-_service = None
-def get_token_service():
-    global _service
-    if _service is None:
-        _service = TokenService()
-    return _service
\ No newline at end of file
+    async def _request_geckoterminal_ohlcv(
+        self,
+        pair_address: str,
+        timeframe: str,
+        limit: int
+    ) -> Optional[List[List[float]]]:
+        """Request OHLCV candles dari GeckoTerminal tanpa cache.
+
+        Returns:
+            List of [timestamp, open, high, low, close, volume] rows,
+            or None if the request failed.
+        """
+        try:
+            # API GeckoTerminal untuk Solana
+            url = f"https://api.geckoterminal.com/api/v2/networks/solana/pools/{pair_address}/ohlcv/{timeframe}"
+            
+            resp = await self._http.get(url, params={"limit": limit}, timeout=self._TIMEOUT_CHART)
+            
+            if resp.status_code == 200:
+                data = orjson.loads(resp.content)
+                # Format GeckoTerminal: [time, open, high, low, close, volume]
+                return data.get("data", {}).get("attributes", {}).get("ohlcv_list", [])
+
+            logger.error(f"GeckoTerminal Error: {resp.status_code} - {resp.text}")
+
+        except Exception as e:
+            logger.error(f"Chart fetch error: {e}")
+
+        return None
+
+# Singleton Instance (lru_cache: dibuat sekali, aman dari race saat request pertama)
+@lru_cache(maxsize=1)
+def get_token_service() -> TokenService:
+    return TokenService()
\ No newline at end of file
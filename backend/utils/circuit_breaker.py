@@ -0,0 +1,109 @@
+"""Circuit breaker for external API calls.
+
+When an upstream provider starts failing (timeouts, 429s, 5xx), every
+request would otherwise wait out the full timeout. The breaker opens after
+a run of consecutive failures and fast-fails calls for a cooldown period.
+After the cooldown it is half-open: a single trial request is let through
+to probe recovery while every other call keeps failing fast until the
+probe succeeds (closing the circuit) or fails (re-opening it).
+"""
+
+import time
+import logging
+from typing import Optional
+
+from .exceptions import ExternalAPIException
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    Attributes:
+        name: Service name used in logs and exceptions
+        failure_threshold: Consecutive failures before the circuit opens
+        cooldown: Seconds to fast-fail once open
+        failures: Current consecutive failure count
+        opened_at: Monotonic time the circuit opened (None when closed)
+        probing: True while the half-open trial request is in flight
+
+    Examples:
+        >>> breaker = CircuitBreaker("DexScreener")
+        >>> is_probe = breaker.check()  # raises ExternalAPIException while open
+        >>> breaker.record_failure()
+        >>> if is_probe:
+        ...     breaker.cancel_probe()  # only if the probe never got an outcome
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, cooldown: float = 5.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+
+    @property
+    def open(self) -> bool:
+        """True while the circuit is open and calls should be skipped."""
+        return (
+            self.opened_at is not None
+            and time.monotonic() - self.opened_at < self.cooldown
+        )
+
+    def check(self) -> bool:
+        """Raise unless a request may go through.
+
+        Once the cooldown has passed, the first caller becomes the
+        half-open probe; it must report back via record_success,
+        record_failure or cancel_probe.
+
+        Returns:
+            True if the caller is the half-open probe, False otherwise
+
+        Raises:
+            ExternalAPIException: While the cooldown is active, or while
+                the half-open probe is still in flight
+        """
+        if self.opened_at is None:
+            return False
+
+        if self.open:
+            remaining = self.cooldown - (time.monotonic() - self.opened_at)
+            raise ExternalAPIException(
+                self.name,
+                "circuit open, skipping request",
+                details={"retry_after": round(remaining, 2)}
+            )
+
+        if self.probing:
+            raise ExternalAPIException(self.name, "circuit half-open, probe in flight")
+        self.probing = True
+        return True
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self) -> None:
+        """Count a failure; (re)open the circuit once the threshold is hit."""
+        self.failures += 1
+        self.probing = False
+        if self.failures >= self.failure_threshold:
+            if not self.open:
+                logger.warning(
+                    f"{self.name} circuit opened after {self.failures} failures "
+                    f"(cooldown {self.cooldown}s)"
+                )
+            self.opened_at = time.monotonic()
+
+    def cancel_probe(self) -> None:
+        """Release the half-open slot when the probe ended without an outcome.
+
+        Only the caller that check() marked as the probe should call this;
+        anyone else would free a slot that another request still holds.
+        """
+        self.probing = False
@@ -6,9 +6,9 @@ for better debugging and monitoring.
 
 import logging
 import sys
+import time
 from typing import Any, Dict
-import json
-from datetime import datetime
+import orjson
 
 
 class StructuredFormatter(logging.Formatter):
@@ -17,6 +17,27 @@ class StructuredFormatter(logging.Formatter):
     This makes logs easier to parse and analyze in production environments.
     """
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (epoch second, formatted second) - rebuilt at most once per second
+        self._time_cache = (-1, "")
+        # Fixed-schema output filled with a single format_map call; only the
+        # message needs JSON escaping (identifiers and level names are plain)
+        self._tmpl = (
+            '{{"timestamp":"{timestamp}","level":"{level}","logger":"{logger}",'
+            '"message":{message_json},"module":"{module}","function":"{function}",'
+            '"line":{line}}}'
+        )
+    
+    def _timestamp(self, created: float) -> str:
+        """Format record time as ISO-8601 UTC with milliseconds, without datetime objects."""
+        sec = int(created)
+        cached_sec, cached_str = self._time_cache
+        if sec != cached_sec:
+            cached_str = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+            self._time_cache = (sec, cached_str)
+        return f"{cached_str}.{int((created - sec) * 1000):03d}Z"
+    
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON.
         
@@ -26,8 +47,19 @@ class StructuredFormatter(logging.Formatter):
         Returns:
             JSON-formatted log string
         """
+        if not record.exc_info and not hasattr(record, "extra_data"):
+            return self._tmpl.format_map({
+                "timestamp": self._timestamp(record.created),
+                "level": record.levelname,
+                "logger": record.name,
+                "message_json": orjson.dumps(record.getMessage()).decode(),
+                "module": record.module,
+                "function": record.funcName,
+                "line": record.lineno,
+            })
+        
         log_data: Dict[str, Any] = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -44,15 +76,24 @@ class StructuredFormatter(logging.Formatter):
         if hasattr(record, "extra_data"):
             log_data["extra"] = record.extra_data
         
-        return json.dumps(log_data)
+        return orjson.dumps(log_data).decode()
 
 
 class SimpleFormatter(logging.Formatter):
     """Human-readable formatter for development."""
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (epoch second, formatted second) - rebuilt at most once per second
+        self._time_cache = (-1, "")
+    
     def format(self, record: logging.LogRecord) -> str:
         """Format log record in readable format."""
-        timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+        sec = int(record.created)
+        cached_sec, timestamp = self._time_cache
+        if sec != cached_sec:
+            timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(sec))
+            self._time_cache = (sec, timestamp)
         level_colors = {
             "DEBUG": "\033[36m",    # Cyan
             "INFO": "\033[32m",     # Green
@@ -10,7 +10,8 @@ from .exceptions import ValidationException
 
 
 # Solana address regex pattern (base58, 32-44 characters)
-SOLANA_ADDRESS_PATTERN = re.compile(r'^[1-9A-HJ-NP-Za-km-z]{32,44}$')
+# \Z instead of $ so a trailing newline can't slip through
+SOLANA_ADDRESS_PATTERN = re.compile(r'^[1-9A-HJ-NP-Za-km-z]{32,44}\Z')
 
 
 def validate_solana_address(address: str, field_name: str = "address") -> str:
@@ -41,7 +42,8 @@ def validate_solana_address(address: str, field_name: str = "address") -> str:
     
     address = address.strip()
     
-    if not SOLANA_ADDRESS_PATTERN.match(address):
+    # Length check first: most garbage input is rejected without running the regex
+    if not (32 <= len(address) <= 44) or not SOLANA_ADDRESS_PATTERN.match(address):
         raise ValidationException(
             f"Invalid {field_name} format. Must be a valid Solana address (32-44 base58 characters)",
             details={
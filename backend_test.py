@@ -4,23 +4,169 @@ Backend API Testing Suite
 Tests Jupiter API integration after hostname fix
 """
 
+import argparse
 import asyncio
+import hashlib
 import httpx
-import json
+import importlib.util
+import io
+import orjson
+import os
+import statistics
 import sys
+import time
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
 
-# Backend URL from frontend/.env
-BACKEND_URL = "https://address-search-fix-1.preview.emergentagent.com/api"
+@dataclass(frozen=True, slots=True)
+class Cfg:
+    backend_url: str
+    sol: str
+    usdc: str
+    user_token_1: str
+    user_token_2: str
+    wallet: str
+    
+    @classmethod
+    def from_env(cls):
+        """Read the target from the environment, defaulting to the preview deployment"""
+        return cls(
+            # Backend URL from frontend/.env
+            backend_url=os.getenv("BACKEND_URL", "https://address-search-fix-1.preview.emergentagent.com/api"),
+            sol="So11111111111111111111111111111111111111112",  # SOL
+            usdc="EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",  # USDC
+            user_token_1="4ymWDE5kwxZ5rxN3mWLvJEBHESbZSiqBuvWmSVcGqZdj",  # User's TEKRA token 1
+            user_token_2="FShCGqGUWRZkqovteJBGegUJAcjRzHZiBmHYGgSqpump",  # User's TEKRA token 2
+            # Test wallet address (example)
+            wallet=os.getenv("TEST_WALLET", "EcC2sMMECMwJRG8ZDjpyRpjR4YMFGY5GmCU7qNBqDLFp"),
+        )
+
+CFG = Cfg.from_env()
+
+# HTTP/2 lets the concurrent sub-tests multiplex over one connection;
+# httpx needs the optional h2 package for it, so fall back to HTTP/1.1
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Keep idle connections alive between sub-tests (nginx default is 75s)
+CLIENT_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=30.0)
+CLIENT_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+# Opt-in on-disk cache for idempotent GETs, for fast local re-runs (off in CI)
+CACHE_ENABLED = os.environ.get("TEKRA_TEST_CACHE") == "1"
+CACHE_DIR = Path(__file__).parent / ".cache" / "backend_test"
+
+JSON_HEADERS = {"content-type": "application/json"}
+
+# Gateway errors from the preview deployment are usually transient
+RETRY_STATUSES = frozenset((502, 503, 504))
+
+# Fields a successful response must contain
+REQUIRED_QUOTE = frozenset(("inAmount", "outAmount", "priceImpactPct"))
+REQUIRED_SWAP = frozenset(("transaction", "expectedOutput"))
+
+def _quote_params(input_mint, output_mint, amount):
+    # Read-only view, so a test helper cannot mutate the shared table
+    return MappingProxyType({
+        "inputMint": input_mint,
+        "outputMint": output_mint,
+        "amount": amount,
+        "slippageBps": 100
+    })
+
+def _swap_body(wallet, input_mint, output_mint, amount, dex="jupiter"):
+    # Encoded once when the case table is built; posted as raw bytes
+    return orjson.dumps({
+        "inputMint": input_mint,
+        "outputMint": output_mint,
+        "amount": amount,
+        "slippageBps": 100,
+        "userPublicKey": wallet,
+        "dex": dex
+    })
+
+@lru_cache(maxsize=None)
+def quote_cases(cfg):
+    """Quote cases (test name, query params, required fields, expect_error), built once per config"""
+    return (
+        ("SOL to USDC Quote", _quote_params(cfg.sol, cfg.usdc, 1000000000), REQUIRED_QUOTE, False),  # 1 SOL (9 decimals)
+        ("User Token 1 to SOL Quote", _quote_params(cfg.user_token_1, cfg.sol, 1000000000), REQUIRED_QUOTE, False),  # 1 token (assuming 9 decimals)
+        ("User Token 2 to USDC Quote", _quote_params(cfg.user_token_2, cfg.usdc, 1000000000), REQUIRED_QUOTE, False),  # 1 token (assuming 9 decimals)
+        ("Invalid Token Error Handling", _quote_params("InvalidTokenAddress123", cfg.usdc, 1000000000), REQUIRED_QUOTE, True),
+    )
 
-# Test token addresses
-SOL_TOKEN = "So11111111111111111111111111111111111111112"  # SOL
-USDC_TOKEN = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"  # USDC
-USER_TOKEN_1 = "4ymWDE5kwxZ5rxN3mWLvJEBHESbZSiqBuvWmSVcGqZdj"  # User's TEKRA token 1
-USER_TOKEN_2 = "FShCGqGUWRZkqovteJBGegUJAcjRzHZiBmHYGgSqpump"  # User's TEKRA token 2
+@lru_cache(maxsize=None)
+def swap_cases(cfg):
+    """Swap preparation cases without execution (test name, JSON body bytes, required fields, expect_error), built once per config"""
+    return (
+        ("SOL to USDC Swap Preparation", _swap_body(cfg.wallet, cfg.sol, cfg.usdc, 100000000), REQUIRED_SWAP, False),  # 0.1 SOL
+        ("User Token to SOL Swap Preparation", _swap_body(cfg.wallet, cfg.user_token_1, cfg.sol, 1000000000), REQUIRED_SWAP, False),  # 1 token
+        ("Invalid DEX Error Handling", _swap_body(cfg.wallet, cfg.sol, cfg.usdc, 100000000, dex="invalid_dex"), REQUIRED_SWAP, True),
+        ("Invalid Token Validation in Swap", _swap_body(cfg.wallet, "InvalidTokenAddress123", cfg.usdc, 100000000), REQUIRED_SWAP, True),
+    )
 
-# Test wallet address (example)
-TEST_WALLET = "EcC2sMMECMwJRG8ZDjpyRpjR4YMFGY5GmCU7qNBqDLFp"
+def _json(response):
+    """Decode a response body with orjson (same dict/list types as response.json())"""
+    return orjson.loads(response.content)
+
+async def with_retry(fn, *, attempts=3):
+    """Await fn() again on 502/503/504 or transport errors, with exponential backoff"""
+    for attempt in range(attempts):
+        last = attempt == attempts - 1
+        try:
+            response = await fn()
+            if response.status_code not in RETRY_STATUSES or last:
+                return response
+        except httpx.TransportError:
+            if last:
+                raise
+        await asyncio.sleep(0.2 * (2 ** attempt))
+
+def _err(response):
+    """Describe a failed response, decoding at most 512 bytes of the body (error pages can be large)"""
+    return f"HTTP {response.status_code}: {response.content[:512].decode('utf-8', 'replace')}"
+
+async def cached_get(client, url, params=None, ttl=60, **kwargs):
+    """GET through the on-disk cache when TEKRA_TEST_CACHE=1, otherwise straight to the network"""
+    if not CACHE_ENABLED:
+        return await with_retry(lambda: client.get(url, params=params, **kwargs))
+    
+    key = repr((str(client.base_url), url, tuple(sorted((params or {}).items()))))
+    path = CACHE_DIR / f"{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}.json"
+    
+    try:
+        if time.time() - path.stat().st_mtime < ttl:
+            cached = orjson.loads(path.read_bytes())
+            return httpx.Response(
+                cached["status_code"],
+                headers={"content-type": cached["content_type"]},
+                content=cached["body"].encode(),
+                request=client.build_request("GET", url, params=params)
+            )
+    except (OSError, ValueError, KeyError):
+        pass
+    
+    response = await with_retry(lambda: client.get(url, params=params, **kwargs))
+    
+    # Server errors are usually transient, so only cache definitive answers
+    if response.status_code < 500:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(orjson.dumps({
+            "status_code": response.status_code,
+            "content_type": response.headers.get("content-type", "application/json"),
+            "body": response.text
+        }))
+    return response
+
+@dataclass(slots=True)
+class TestRecord:
+    test: str
+    passed: bool
+    details: str = ""
+    error: str = ""
+    ts: float = 0.0  # time.monotonic() when recorded
 
 class TestResults:
     def __init__(self):
@@ -29,489 +175,343 @@ class TestResults:
         self.failed = 0
     
     def add_result(self, test_name, passed, details="", error=""):
-        self.tests.append({
-            "test": test_name,
-            "passed": passed,
-            "details": details,
-            "error": error,
-            "timestamp": datetime.now().isoformat()
-        })
+        self.tests.append(TestRecord(test_name, passed, details, error, time.monotonic()))
         if passed:
             self.passed += 1
         else:
             self.failed += 1
     
-    def print_summary(self):
-        print(f"\n{'='*60}")
-        print(f"JUPITER API TEST RESULTS")
-        print(f"{'='*60}")
-        print(f"Total Tests: {len(self.tests)}")
-        print(f"Passed: {self.passed}")
-        print(f"Failed: {self.failed}")
-        print(f"Success Rate: {(self.passed/len(self.tests)*100):.1f}%" if self.tests else "0%")
-        print(f"{'='*60}")
+    def merge(self, *others):
+        """Append the records of other results and recount passed/failed in one pass"""
+        for other in others:
+            self.tests.extend(other.tests)
+        self.passed = sum(1 for test in self.tests if test.passed)
+        self.failed = len(self.tests) - self.passed
+        return self
+    
+    def print_summary(self, ascii_only=False):
+        # Build the whole report first and emit it with a single write
+        buf = io.StringIO()
+        buf.write(f"\n{'='*60}\n")
+        buf.write("JUPITER API TEST RESULTS\n")
+        buf.write(f"{'='*60}\n")
+        buf.write(f"Total Tests: {len(self.tests)}\n")
+        buf.write(f"Passed: {self.passed}\n")
+        buf.write(f"Failed: {self.failed}\n")
+        buf.write(f"Success Rate: {(self.passed/len(self.tests)*100):.1f}%\n" if self.tests else "0%\n")
+        buf.write(f"{'='*60}\n")
         
+        passed_label, failed_label = ("[OK]", "[FAIL]") if ascii_only else ("✅ PASS", "❌ FAIL")
         for test in self.tests:
-            status = "✅ PASS" if test["passed"] else "❌ FAIL"
-            print(f"{status} {test['test']}")
-            if test["details"]:
-                print(f"    Details: {test['details']}")
-            if test["error"]:
-                print(f"    Error: {test['error']}")
-            print()
+            buf.write(f"{passed_label if test.passed else failed_label} {test.test}\n")
+            if test.details:
+                buf.write(f"    Details: {test.details}\n")
+            if test.error:
+                buf.write(f"    Error: {test.error}\n")
+            buf.write("\n")
+        
+        sys.stdout.write(buf.getvalue())
 
-async def test_jupiter_quote_endpoint():
-    """Test GET /api/quote endpoint with Jupiter API"""
-    results = TestResults()
-    
-    async with httpx.AsyncClient(timeout=30.0) as client:
+async def run_quote_case(client, name, params, required, expect_error=False):
+    """Run one GET /api/quote case and return (name, passed, details, error)"""
+    try:
+        print(f"Testing {name}...")
+        response = await cached_get(client, "/quote", params=params)
         
-        # Test 1: SOL to USDC quote
-        try:
-            print("Testing SOL to USDC quote...")
-            response = await client.get(
-                f"{BACKEND_URL}/quote",
-                params={
-                    "inputMint": SOL_TOKEN,
-                    "outputMint": USDC_TOKEN,
-                    "amount": 1000000000,  # 1 SOL (9 decimals)
-                    "slippageBps": 100
-                }
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                required_fields = ["inAmount", "outAmount", "priceImpactPct"]
-                
-                if all(field in data for field in required_fields):
-                    results.add_result(
-                        "SOL to USDC Quote",
-                        True,
-                        f"inAmount: {data['inAmount']}, outAmount: {data['outAmount']}, priceImpact: {data['priceImpactPct']}%"
-                    )
-                else:
-                    missing = [f for f in required_fields if f not in data]
-                    results.add_result(
-                        "SOL to USDC Quote",
-                        False,
-                        error=f"Missing required fields: {missing}"
-                    )
-            else:
-                results.add_result(
-                    "SOL to USDC Quote",
-                    False,
-                    error=f"HTTP {response.status_code}: {response.text}"
-                )
-                
-        except Exception as e:
-            results.add_result(
-                "SOL to USDC Quote",
-                False,
-                error=f"Request failed: {str(e)}"
-            )
+        if expect_error:
+            if response.status_code >= 400:
+                return name, True, f"Correctly returned error status {response.status_code}", ""
+            return name, False, "", f"Should have returned error but got {response.status_code}"
         
-        # Test 2: User Token 1 to SOL quote
-        try:
-            print("Testing User Token 1 to SOL quote...")
-            response = await client.get(
-                f"{BACKEND_URL}/quote",
-                params={
-                    "inputMint": USER_TOKEN_1,
-                    "outputMint": SOL_TOKEN,
-                    "amount": 1000000000,  # 1 token (assuming 9 decimals)
-                    "slippageBps": 100
-                }
-            )
+        if response.is_success:
+            data = _json(response)
+            missing = required.difference(data)
             
-            if response.status_code == 200:
-                data = response.json()
-                required_fields = ["inAmount", "outAmount", "priceImpactPct"]
-                
-                if all(field in data for field in required_fields):
-                    results.add_result(
-                        "User Token 1 to SOL Quote",
-                        True,
-                        f"inAmount: {data['inAmount']}, outAmount: {data['outAmount']}, priceImpact: {data['priceImpactPct']}%"
-                    )
-                else:
-                    missing = [f for f in required_fields if f not in data]
-                    results.add_result(
-                        "User Token 1 to SOL Quote",
-                        False,
-                        error=f"Missing required fields: {missing}"
-                    )
-            else:
-                results.add_result(
-                    "User Token 1 to SOL Quote",
-                    False,
-                    error=f"HTTP {response.status_code}: {response.text}"
+            if not missing:
+                return (
+                    name,
+                    True,
+                    f"inAmount: {data['inAmount']}, outAmount: {data['outAmount']}, priceImpact: {data['priceImpactPct']}%",
+                    ""
                 )
-                
-        except Exception as e:
-            results.add_result(
-                "User Token 1 to SOL Quote",
-                False,
-                error=f"Request failed: {str(e)}"
-            )
+            return name, False, "", f"Missing required fields: {sorted(missing)}"
         
-        # Test 3: User Token 2 to USDC quote
-        try:
-            print("Testing User Token 2 to USDC quote...")
-            response = await client.get(
-                f"{BACKEND_URL}/quote",
-                params={
-                    "inputMint": USER_TOKEN_2,
-                    "outputMint": USDC_TOKEN,
-                    "amount": 1000000000,  # 1 token (assuming 9 decimals)
-                    "slippageBps": 100
-                }
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                required_fields = ["inAmount", "outAmount", "priceImpactPct"]
-                
-                if all(field in data for field in required_fields):
-                    results.add_result(
-                        "User Token 2 to USDC Quote",
-                        True,
-                        f"inAmount: {data['inAmount']}, outAmount: {data['outAmount']}, priceImpact: {data['priceImpactPct']}%"
-                    )
-                else:
-                    missing = [f for f in required_fields if f not in data]
-                    results.add_result(
-                        "User Token 2 to USDC Quote",
-                        False,
-                        error=f"Missing required fields: {missing}"
-                    )
-            else:
-                results.add_result(
-                    "User Token 2 to USDC Quote",
-                    False,
-                    error=f"HTTP {response.status_code}: {response.text}"
-                )
-                
-        except Exception as e:
-            results.add_result(
-                "User Token 2 to USDC Quote",
-                False,
-                error=f"Request failed: {str(e)}"
-            )
+        return name, False, "", _err(response)
         
-        # Test 4: Invalid token address error handling
-        try:
-            print("Testing invalid token address error handling...")
-            response = await client.get(
-                f"{BACKEND_URL}/quote",
-                params={
-                    "inputMint": "InvalidTokenAddress123",
-                    "outputMint": USDC_TOKEN,
-                    "amount": 1000000000,
-                    "slippageBps": 100
-                }
-            )
-            
+    except Exception as e:
+        return name, False, "", f"Request failed: {str(e)}"
+
+async def run_swap_case(client, name, body, required, expect_error=False):
+    """Run one POST /api/swap case and return (name, passed, details, error)"""
+    try:
+        print(f"Testing {name}...")
+        # Swap preparation only builds a transaction, so retrying is safe
+        response = await with_retry(lambda: client.post("/swap", content=body, headers=JSON_HEADERS))
+        
+        if expect_error:
             if response.status_code >= 400:
-                results.add_result(
-                    "Invalid Token Error Handling",
-                    True,
-                    f"Correctly returned error status {response.status_code}"
-                )
-            else:
-                results.add_result(
-                    "Invalid Token Error Handling",
-                    False,
-                    error=f"Should have returned error but got {response.status_code}"
-                )
-                
-        except Exception as e:
-            results.add_result(
-                "Invalid Token Error Handling",
-                False,
-                error=f"Request failed: {str(e)}"
-            )
+                return name, True, f"Correctly returned error status {response.status_code}", ""
+            return name, False, "", f"Should have returned error but got {response.status_code}"
+        
+        if response.is_success:
+            data = _json(response)
+            missing = required.difference(data)
+            
+            if not missing:
+                return name, True, f"Transaction prepared, expectedOutput: {data['expectedOutput']}", ""
+            return name, False, "", f"Missing required fields: {sorted(missing)}"
+        
+        return name, False, "", _err(response)
+        
+    except Exception as e:
+        return name, False, "", f"Request failed: {str(e)}"
+
+async def test_jupiter_quote_endpoint(client, cfg):
+    """Test GET /api/quote endpoint with Jupiter API"""
+    results = TestResults()
+    # The cases are independent, so they run concurrently on the shared client
+    cases = await asyncio.gather(*(
+        run_quote_case(client, name, params, required, expect_error)
+        for name, params, required, expect_error in quote_cases(cfg)
+    ))
+    
+    for case in cases:
+        results.add_result(*case)
     
     return results
 
-async def test_jupiter_swap_endpoint():
+async def test_jupiter_swap_endpoint(client, cfg):
     """Test POST /api/swap endpoint with Jupiter API"""
     results = TestResults()
+    # The cases are independent, so they run concurrently on the shared client
+    cases = await asyncio.gather(*(
+        run_swap_case(client, name, body, required, expect_error)
+        for name, body, required, expect_error in swap_cases(cfg)
+    ))
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        
-        # Test 1: SOL to USDC swap preparation (without execution)
-        try:
-            print("Testing SOL to USDC swap preparation...")
-            swap_data = {
-                "inputMint": SOL_TOKEN,
-                "outputMint": USDC_TOKEN,
-                "amount": 100000000,  # 0.1 SOL
-                "slippageBps": 100,
-                "userPublicKey": TEST_WALLET,
-                "dex": "jupiter"
-            }
-            
-            response = await client.post(
-                f"{BACKEND_URL}/swap",
-                json=swap_data
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                required_fields = ["transaction", "expectedOutput"]
-                
-                if all(field in data for field in required_fields):
-                    results.add_result(
-                        "SOL to USDC Swap Preparation",
-                        True,
-                        f"Transaction prepared, expectedOutput: {data['expectedOutput']}"
-                    )
-                else:
-                    missing = [f for f in required_fields if f not in data]
-                    results.add_result(
-                        "SOL to USDC Swap Preparation",
-                        False,
-                        error=f"Missing required fields: {missing}"
-                    )
-            else:
-                results.add_result(
-                    "SOL to USDC Swap Preparation",
-                    False,
-                    error=f"HTTP {response.status_code}: {response.text}"
-                )
-                
-        except Exception as e:
-            results.add_result(
-                "SOL to USDC Swap Preparation",
-                False,
-                error=f"Request failed: {str(e)}"
-            )
-        
-        # Test 2: User Token to SOL swap preparation
-        try:
-            print("Testing User Token to SOL swap preparation...")
-            swap_data = {
-                "inputMint": USER_TOKEN_1,
-                "outputMint": SOL_TOKEN,
-                "amount": 1000000000,  # 1 token
-                "slippageBps": 100,
-                "userPublicKey": TEST_WALLET,
-                "dex": "jupiter"
-            }
-            
-            response = await client.post(
-                f"{BACKEND_URL}/swap",
-                json=swap_data
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                required_fields = ["transaction", "expectedOutput"]
-                
-                if all(field in data for field in required_fields):
-                    results.add_result(
-                        "User Token to SOL Swap Preparation",
-                        True,
-                        f"Transaction prepared, expectedOutput: {data['expectedOutput']}"
-                    )
-                else:
-                    missing = [f for f in required_fields if f not in data]
-                    results.add_result(
-                        "User Token to SOL Swap Preparation",
-                        False,
-                        error=f"Missing required fields: {missing}"
-                    )
-            else:
-                results.add_result(
-                    "User Token to SOL Swap Preparation",
-                    False,
-                    error=f"HTTP {response.status_code}: {response.text}"
-                )
-                
-        except Exception as e:
-            results.add_result(
-                "User Token to SOL Swap Preparation",
-                False,
-                error=f"Request failed: {str(e)}"
-            )
+    for case in cases:
+        results.add_result(*case)
+    
+    return results
+
+async def test_backend_health(client, cfg):
+    """Test basic backend health and connectivity"""
+    results = TestResults()
+    
+    # Test 1: Basic API health
+    try:
+        print("Testing backend API health...")
+        response = await cached_get(client, "/", timeout=15.0)
         
-        # Test 3: Invalid DEX error handling
-        try:
-            print("Testing invalid DEX error handling...")
-            swap_data = {
-                "inputMint": SOL_TOKEN,
-                "outputMint": USDC_TOKEN,
-                "amount": 100000000,
-                "slippageBps": 100,
-                "userPublicKey": TEST_WALLET,
-                "dex": "invalid_dex"
-            }
-            
-            response = await client.post(
-                f"{BACKEND_URL}/swap",
-                json=swap_data
-            )
-            
-            if response.status_code >= 400:
+        if response.is_success:
+            data = _json(response)
+            if "message" in data:
                 results.add_result(
-                    "Invalid DEX Error Handling",
+                    "Backend API Health",
                     True,
-                    f"Correctly returned error status {response.status_code}"
+                    f"API responding: {data['message']}"
                 )
             else:
                 results.add_result(
-                    "Invalid DEX Error Handling",
+                    "Backend API Health",
                     False,
-                    error=f"Should have returned error but got {response.status_code}"
+                    error="Response missing message field"
                 )
-                
-        except Exception as e:
+        else:
             results.add_result(
-                "Invalid DEX Error Handling",
+                "Backend API Health",
                 False,
-                error=f"Request failed: {str(e)}"
-            )
-        
-        # Test 4: Invalid token validation
-        try:
-            print("Testing invalid token validation in swap...")
-            swap_data = {
-                "inputMint": "InvalidTokenAddress123",
-                "outputMint": USDC_TOKEN,
-                "amount": 100000000,
-                "slippageBps": 100,
-                "userPublicKey": TEST_WALLET,
-                "dex": "jupiter"
-            }
-            
-            response = await client.post(
-                f"{BACKEND_URL}/swap",
-                json=swap_data
+                error=_err(response)
             )
             
-            if response.status_code >= 400:
+    except Exception as e:
+        results.add_result(
+            "Backend API Health",
+            False,
+            error=f"Request failed: {str(e)}"
+        )
+    
+    # Test 2: Token list endpoint
+    try:
+        print("Testing token list endpoint...")
+        response = await cached_get(client, "/token-list", timeout=15.0)
+        
+        if response.is_success:
+            data = _json(response)
+            if "tokens" in data and isinstance(data["tokens"], list):
+                token_count = len(data["tokens"])
                 results.add_result(
-                    "Invalid Token Validation in Swap",
+                    "Token List Endpoint",
                     True,
-                    f"Correctly returned error status {response.status_code}"
+                    f"Retrieved {token_count} tokens"
                 )
             else:
                 results.add_result(
-                    "Invalid Token Validation in Swap",
+                    "Token List Endpoint",
                     False,
-                    error=f"Should have returned error but got {response.status_code}"
+                    error="Response missing tokens array"
                 )
-                
-        except Exception as e:
+        else:
             results.add_result(
-                "Invalid Token Validation in Swap",
+                "Token List Endpoint",
                 False,
-                error=f"Request failed: {str(e)}"
+                error=_err(response)
             )
+            
+    except Exception as e:
+        results.add_result(
+            "Token List Endpoint",
+            False,
+            error=f"Request failed: {str(e)}"
+        )
     
     return results
 
-async def test_backend_health():
-    """Test basic backend health and connectivity"""
-    results = TestResults()
+async def run_suites(client, cfg):
+    """Run the correctness suites and combine their results"""
+    # Run all test suites concurrently (each is bound by network round-trips)
+    suites = {
+        "Backend Health Suite": test_backend_health,
+        "Jupiter Quote Suite": test_jupiter_quote_endpoint,
+        "Jupiter Swap Suite": test_jupiter_swap_endpoint,
+    }
+    suite_results = await asyncio.gather(
+        *(suite(client, cfg) for suite in suites.values()),
+        return_exceptions=True
+    )
     
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        
-        # Test 1: Basic API health
-        try:
-            print("Testing backend API health...")
-            response = await client.get(f"{BACKEND_URL}/")
-            
-            if response.status_code == 200:
-                data = response.json()
-                if "message" in data:
-                    results.add_result(
-                        "Backend API Health",
-                        True,
-                        f"API responding: {data['message']}"
-                    )
-                else:
-                    results.add_result(
-                        "Backend API Health",
-                        False,
-                        error="Response missing message field"
-                    )
-            else:
-                results.add_result(
-                    "Backend API Health",
-                    False,
-                    error=f"HTTP {response.status_code}: {response.text}"
-                )
-                
-        except Exception as e:
-            results.add_result(
-                "Backend API Health",
-                False,
-                error=f"Request failed: {str(e)}"
-            )
-        
-        # Test 2: Token list endpoint
+    # Combine all results; a crashed suite is reported instead of aborting the run
+    all_results = TestResults()
+    finished = []
+    for suite_name, suite_result in zip(suites, suite_results):
+        if isinstance(suite_result, BaseException):
+            all_results.add_result(suite_name, False, error=f"Suite crashed: {suite_result!r}")
+        else:
+            finished.append(suite_result)
+    
+    return all_results.merge(*finished)
+
+async def stress_case(name, call, concurrency, repeat):
+    """Fire call() `concurrency` times in parallel, `repeat` rounds, and summarize latencies"""
+    latencies = []
+    
+    async def timed():
+        start = time.perf_counter()
         try:
-            print("Testing token list endpoint...")
-            response = await client.get(f"{BACKEND_URL}/token-list")
-            
-            if response.status_code == 200:
-                data = response.json()
-                if "tokens" in data and isinstance(data["tokens"], list):
-                    token_count = len(data["tokens"])
-                    results.add_result(
-                        "Token List Endpoint",
-                        True,
-                        f"Retrieved {token_count} tokens"
-                    )
-                else:
-                    results.add_result(
-                        "Token List Endpoint",
-                        False,
-                        error="Response missing tokens array"
-                    )
-            else:
-                results.add_result(
-                    "Token List Endpoint",
-                    False,
-                    error=f"HTTP {response.status_code}: {response.text}"
-                )
-                
-        except Exception as e:
-            results.add_result(
-                "Token List Endpoint",
-                False,
-                error=f"Request failed: {str(e)}"
-            )
+            # 4xx is the expected answer for the invalid-input cases
+            ok = (await call()).status_code < 500
+        except httpx.HTTPError:
+            ok = False
+        latencies.append(time.perf_counter() - start)
+        return ok
+    
+    failures = 0
+    for _ in range(repeat):
+        outcomes = await asyncio.gather(*(timed() for _ in range(concurrency)))
+        failures += outcomes.count(False)
+    
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = latencies[0]
+    
+    details = (
+        f"{len(latencies)} requests, p50: {p50 * 1000:.0f}ms, "
+        f"p95: {p95 * 1000:.0f}ms, p99: {p99 * 1000:.0f}ms"
+    )
+    error = f"{failures}/{len(latencies)} requests failed" if failures else ""
+    return name, failures == 0, details, error
+
+async def run_stress(client, cfg, concurrency, repeat):
+    """Load-probe every case; cases run one after another so their latencies stay separate"""
+    results = TestResults()
+    
+    calls = [
+        ("Backend API Health", lambda: client.get("/")),
+        ("Token List Endpoint", lambda: client.get("/token-list")),
+    ]
+    calls += [
+        (name, lambda params=params: client.get("/quote", params=params))
+        for name, params, _, _ in quote_cases(cfg)
+    ]
+    calls += [
+        (name, lambda body=body: client.post("/swap", content=body, headers=JSON_HEADERS))
+        for name, body, _, _ in swap_cases(cfg)
+    ]
+    
+    for name, call in calls:
+        print(f"Stressing {name} ({concurrency} x {repeat})...")
+        results.add_result(*await stress_case(name, call, concurrency, repeat))
     
     return results
 
-async def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Backend API Testing Suite")
+    parser.add_argument(
+        "--concurrency", type=int, default=0,
+        help="stress mode: fire each case N times in parallel and report p50/p95/p99 latency"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1,
+        help="stress mode: number of parallel rounds per case"
+    )
+    parser.add_argument(
+        "--ascii", action="store_true",
+        help="use [OK]/[FAIL] instead of emoji status markers in the summary"
+    )
+    return parser.parse_args(argv)
+
+async def main(argv=None, cfg=None):
     """Run all Jupiter API tests"""
+    args = parse_args(argv)
+    cfg = cfg or CFG
+    
     print("Starting Jupiter API Integration Tests...")
-    print(f"Backend URL: {BACKEND_URL}")
+    print(f"Backend URL: {cfg.backend_url}")
     print(f"Test Timestamp: {datetime.now().isoformat()}")
     print("="*60)
     
-    # Run all test suites
-    health_results = await test_backend_health()
-    quote_results = await test_jupiter_quote_endpoint()
-    swap_results = await test_jupiter_swap_endpoint()
+    limits = CLIENT_LIMITS
+    if args.concurrency > limits.max_connections:
+        limits = httpx.Limits(
+            max_connections=args.concurrency,
+            max_keepalive_connections=args.concurrency,
+            keepalive_expiry=limits.keepalive_expiry
+        )
     
-    # Combine all results
-    all_results = TestResults()
-    all_results.tests.extend(health_results.tests)
-    all_results.tests.extend(quote_results.tests)
-    all_results.tests.extend(swap_results.tests)
-    all_results.passed = health_results.passed + quote_results.passed + swap_results.passed
-    all_results.failed = health_results.failed + quote_results.failed + swap_results.failed
+    # One client for every suite, so connections are reused across the run
+    async with httpx.AsyncClient(
+        base_url=cfg.backend_url,
+        http2=HTTP2_AVAILABLE,
+        limits=limits,
+        timeout=CLIENT_TIMEOUT
+    ) as client:
+        # Start DNS/TCP/TLS (and the HTTP/2 connection) while the cases are set up
+        prewarm = asyncio.create_task(client.get("/"))
+        try:
+            if args.concurrency > 0:
+                # Keep the handshake out of the measured latencies
+                await asyncio.gather(prewarm, return_exceptions=True)
+                all_results = await run_stress(client, cfg, args.concurrency, max(1, args.repeat))
+            else:
+                all_results = await run_suites(client, cfg)
+        finally:
+            # The prewarm response itself is not checked
+            await asyncio.gather(prewarm, return_exceptions=True)
     
     # Print comprehensive summary
-    all_results.print_summary()
+    all_results.print_summary(ascii_only=args.ascii)
     
     # Return exit code based on results
     return 0 if all_results.failed == 0 else 1
 
 if __name__ == "__main__":
-    exit_code = asyncio.run(main())
-    sys.exit(exit_code)
\ No newline at end of file
+    # Faster event loop when available (not on Windows)
+    try:
+        import uvloop
+    except ImportError:
+        exit_code = asyncio.run(main())
+    else:
+        exit_code = uvloop.run(main())
+    sys.exit(exit_code)
@@ -22,9 +22,11 @@ export function PriceChart() {
         params: { token: TARGET_TOKEN, interval: "1h" },
       });
       
-      const formattedData = response.data.data.map(item => ({
-        time: new Date(item.timestamp).toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' }),
-        price: item.price,
+      // Backend mengirim data kolom: { t: [ms], p: [price], v: [volume] }
+      const { t, p } = response.data.data;
+      const formattedData = t.map((timestamp, i) => ({
+        time: new Date(timestamp).toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' }),
+        price: p[i],
       }));
       
       setChartData(formattedData);
@@ -0,0 +1,82 @@
+"""Tests for the circuit breaker's closed -> open -> half-open cycle."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from utils import circuit_breaker  # noqa: E402
+from utils.circuit_breaker import CircuitBreaker  # noqa: E402
+from utils.exceptions import ExternalAPIException  # noqa: E402
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", clock)
+    return clock
+
+
+def _open_breaker():
+    breaker = CircuitBreaker("Test", failure_threshold=2, cooldown=5.0)
+    assert breaker.check() is False
+    breaker.record_failure()
+    assert breaker.check() is False
+    breaker.record_failure()
+    return breaker
+
+
+def test_open_circuit_fast_fails_until_cooldown(clock):
+    breaker = _open_breaker()
+
+    with pytest.raises(ExternalAPIException):
+        breaker.check()
+    clock.now += 4.9
+    with pytest.raises(ExternalAPIException):
+        breaker.check()
+
+
+def test_single_probe_after_cooldown_then_close(clock):
+    breaker = _open_breaker()
+    clock.now += 5.0
+
+    assert breaker.check() is True
+    # Everyone else fast-fails while the probe is in flight
+    with pytest.raises(ExternalAPIException):
+        breaker.check()
+
+    breaker.record_success()
+    assert breaker.check() is False
+    assert breaker.failures == 0
+
+
+def test_failed_probe_reopens_circuit(clock):
+    breaker = _open_breaker()
+    clock.now += 5.0
+
+    assert breaker.check() is True
+    breaker.record_failure()
+
+    with pytest.raises(ExternalAPIException):
+        breaker.check()
+    clock.now += 5.0
+    assert breaker.check() is True
+
+
+def test_cancelled_probe_frees_the_slot(clock):
+    breaker = _open_breaker()
+    clock.now += 5.0
+
+    assert breaker.check() is True
+    breaker.cancel_probe()
+    assert breaker.check() is True
@@ -0,0 +1,59 @@
+"""Regression tests for the columnar price chart payload."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from services.token_service import TokenService  # noqa: E402
+
+
+class _StubCache:
+    def __init__(self, value):
+        self.value = value
+
+    async def get_or_fetch(self, key, fetcher):
+        return self.value
+
+
+def _service(ohlcv_list):
+    service = TokenService.__new__(TokenService)
+    service._market_cache = _StubCache(ohlcv_list)
+
+    async def fetch_dexscreener_data(token_address):
+        return {"price_usd": 1.5, "pair_address": "PAIR"}
+
+    service._fetch_dexscreener_data = fetch_dexscreener_data
+    return service
+
+
+def test_multi_row_chart_serializes_through_orjson_response():
+    # GeckoTerminal rows: [timestamp, open, high, low, close, volume], newest first
+    ohlcv_list = [
+        [1700003600, 1.0, 1.2, 0.9, 1.1, 500.0],
+        [1700000000, 0.8, 1.0, 0.7, 0.9, 300.0],
+        [1700007200, 1.1, 1.3, 1.0, 1.2, 700.0],
+    ]
+    chart = asyncio.run(_service(ohlcv_list).get_token_price_chart("MINT", "1h"))
+
+    response = ORJSONResponse(content=chart)
+    data = orjson.loads(response.body)["data"]
+
+    assert data["t"] == [1700000000000, 1700003600000, 1700007200000]
+    assert data["p"] == [0.9, 1.1, 1.2]
+    assert data["v"] == [300.0, 500.0, 700.0]
+
+
+def test_malformed_rows_fall_back_to_empty_chart():
+    ohlcv_list = [
+        [1700000000, 0.8, 1.0, 0.7, 0.9, 300.0],
+        [1700003600, 1.0, 1.2, 0.9, None],
+    ]
+    chart = asyncio.run(_service(ohlcv_list).get_token_price_chart("MINT", "1h"))
+
+    assert chart["data"] == {"t": [], "p": [], "v": []}
+    assert chart["current_price"] == 1.5